@@ -1,7 +1,8 @@
 """
 Application Configuration using Pydantic Settings
 """
-from typing import List, Optional, Dict
+from functools import cached_property
+from typing import FrozenSet, List, Optional, Dict
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -59,6 +60,13 @@ class Settings(BaseSettings):
     IDEMPOTENCY_ENABLED: bool = Field(default=True, description="Enable idempotency")
     IDEMPOTENCY_TTL_SECONDS: int = Field(default=600, description="Idempotency key TTL in seconds")
     
+    # Report cache
+    REPORT_CACHE_TTL_SECONDS: int = Field(default=60, description="Report cache TTL for ranges including today")
+    REPORT_CACHE_HISTORICAL_TTL_SECONDS: int = Field(default=86400, description="Report cache TTL for closed historical ranges")
+    
+    # Shift cache
+    CURRENT_SHIFT_CACHE_TTL_SECONDS: int = Field(default=300, description="Current open shift cache TTL")
+    
     # Logging
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
     LOG_FORMAT: str = Field(default="json", description="Log format: json or console")
@@ -86,6 +94,7 @@ class Settings(BaseSettings):
     S3_SECRET_KEY: str = Field(default="minioadmin", description="S3 secret key")
     S3_USE_SSL: bool = Field(default=False, description="Use SSL for S3 connections")
     S3_SIGNED_URL_TTL: int = Field(default=3600, description="Signed URL TTL in seconds")
+    S3_MAX_POOL_CONNECTIONS: int = Field(default=64, description="Max pooled HTTP connections for the S3 client")
     S3_MAX_FILE_SIZE: int = Field(default=10485760, description="Maximum file size in bytes (10MB)")
     S3_ALLOWED_MIME_TYPES: str = Field(
         default="image/jpeg,image/png,image/webp,image/avif,image/gif",
@@ -174,6 +183,11 @@ class Settings(BaseSettings):
         """Get allowed MIME types as a list"""
         return [mime.strip() for mime in self.S3_ALLOWED_MIME_TYPES.split(",") if mime.strip()]
     
+    @cached_property
+    def allowed_mime_types_set(self) -> FrozenSet[str]:
+        """Get allowed MIME types as a set, parsed once"""
+        return frozenset(self.allowed_mime_types_list)
+    
     @property
     def media_variant_sizes_dict(self) -> Dict[str, Dict[str, int]]:
         """Get media variant sizes as a dictionary"""
@@ -1,10 +1,13 @@
 """
 MongoDB Database Configuration and Connection Management
 """
+from decimal import Decimal
 from typing import Optional
 import structlog
+from bson.codec_options import TypeCodec, TypeRegistry
+from bson.decimal128 import Decimal128
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ServerSelectionTimeoutError
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
 
 from app.config import settings
 
@@ -14,6 +17,27 @@ logger = structlog.get_logger(__name__)
 _database: Optional[AsyncIOMotorDatabase] = None
 _client: Optional[AsyncIOMotorClient] = None
 
+# Set once the unique open-shift index exists; until then open_shift checks by reading
+_open_shift_index_ready = False
+
+
+class DecimalCodec(TypeCodec):
+    """Store Python Decimal values as BSON Decimal128 and read them back as Decimal"""
+    
+    python_type = Decimal
+    bson_type = Decimal128
+    
+    def transform_python(self, value: Decimal) -> Decimal128:
+        return Decimal128(value)
+    
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+
+def open_shift_index_ready() -> bool:
+    """Whether the database itself rejects a second open shift per employee"""
+    return _open_shift_index_ready
+
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Get MongoDB database instance"""
@@ -39,6 +63,7 @@ async def connect_to_mongo() -> None:
             socketTimeoutMS=settings.MONGODB_SOCKET_TIMEOUT_MS,
             connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
             retryWrites=True,
+            type_registry=TypeRegistry([DecimalCodec()]),
         )
         
         # Test connection
@@ -74,6 +99,8 @@ async def close_database() -> None:
 
 async def ensure_indexes() -> None:
     """Ensure database indexes are created"""
+    global _open_shift_index_ready
+    
     if _database is None:
         return
     
@@ -94,16 +121,36 @@ async def ensure_indexes() -> None:
         await _database.sales.create_index("reference", unique=True)
         await _database.sales.create_index([("tenant_id", 1), ("store_id", 1), ("timestamp", -1)])
         await _database.sales.create_index([("shift_id", 1), ("timestamp", -1)])
+        await _database.sales.create_index([("store_id", 1), ("timestamp", -1)])
+        await _database.sales_daily_rollups.create_index([("store_id", 1), ("date", 1)], unique=True)
         
         # Tickets collection indexes
         await _database.tickets.create_index("ticket_id", unique=True)
         await _database.tickets.create_index("qr_token", unique=True)
         await _database.tickets.create_index([("tenant_id", 1), ("store_id", 1)])
         await _database.tickets.create_index([("sale_id", 1), ("status", 1)])
+        await _database.tickets.create_index([("store_id", 1), ("timestamp", -1), ("status", 1)])
         
         # Shifts collection indexes
         await _database.shifts.create_index("shift_id", unique=True)
         await _database.shifts.create_index([("tenant_id", 1), ("store_id", 1), ("status", 1)])
+        await _database.shifts.create_index([("store_id", 1), ("timestamp", -1)])
+        try:
+            await _database.shifts.create_index(
+                "opened_by",
+                unique=True,
+                partialFilterExpression={"status": "open"},
+                name="shifts_one_open_per_employee",
+            )
+            _open_shift_index_ready = True
+        except OperationFailure as e:
+            # Existing data has several open shifts for one employee; keep starting,
+            # with open_shift falling back to a read check until they are closed
+            logger.error(
+                "Could not create unique open-shift index; close duplicate open shifts and restart",
+                index="shifts_one_open_per_employee",
+                error=str(e)
+            )
         
         # Packages collection indexes
         await _database.packages.create_index("package_id", unique=True)
@@ -112,6 +159,7 @@ async def ensure_indexes() -> None:
         # Audit logs collection indexes
         await _database.audit_logs.create_index([("tenant_id", 1), ("timestamp", -1)])
         await _database.audit_logs.create_index([("event_type", 1), ("timestamp", -1)])
+        await _database.audit_logs.create_index([("store_id", 1), ("event_type", 1), ("timestamp", -1)])
         await _database.audit_logs.create_index("actor_id")
         
         # Provider reporting indexes (Phase 6)
@@ -9,8 +9,10 @@ from typing import AsyncGenerator
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.utils import is_body_allowed_for_status_code
 import structlog
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
 from app.db.mongo import get_database, close_database
@@ -82,6 +84,7 @@ app = FastAPI(
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
     openapi_url="/openapi.json" if settings.ENVIRONMENT != "production" else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Security middleware
@@ -132,6 +135,20 @@ async def playpark_exception_handler(request: Request, exc: PlayParkException):
     )
 
 
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Handle HTTP exceptions with the orjson encoder"""
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        # 1xx, 204 and 304 responses must not carry a body
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse(
+        content={"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=headers,
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions"""
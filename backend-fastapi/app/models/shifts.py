@@ -2,6 +2,7 @@
 Shift Models
 """
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -35,10 +36,10 @@ class Shift(BaseDocument):
     closed_by: Optional[str] = Field(default=None, description="Closing employee ID")
     open_at: datetime = Field(..., description="Opening timestamp")
     close_at: Optional[datetime] = Field(default=None, description="Closing timestamp")
-    cash_open: float = Field(..., ge=0, description="Opening cash amount")
-    cash_counted: Optional[float] = Field(default=None, ge=0, description="Counted cash amount")
-    cash_expected: Optional[float] = Field(default=None, ge=0, description="Expected cash amount")
-    cash_diff: Optional[float] = Field(default=None, description="Cash difference")
+    cash_open: Decimal = Field(..., ge=0, description="Opening cash amount")
+    cash_counted: Optional[Decimal] = Field(default=None, ge=0, description="Counted cash amount")
+    cash_expected: Optional[Decimal] = Field(default=None, ge=0, description="Expected cash amount")
+    cash_diff: Optional[Decimal] = Field(default=None, description="Cash difference")
     status: ShiftStatus = Field(default=ShiftStatus.OPEN, description="Shift status")
     totals: ShiftTotals = Field(default_factory=ShiftTotals, description="Shift totals")
     notes: Optional[str] = Field(default=None, description="Shift notes")
@@ -52,14 +53,15 @@ class ShiftOpenRequest(BaseModel):
     """Shift opening request"""
     
     employee_id: str = Field(..., description="Employee ID")
-    cash_open: float = Field(..., ge=0, description="Opening cash amount")
+    cash_open: Decimal = Field(..., ge=0, decimal_places=2, description="Opening cash amount")
+    notes: Optional[str] = Field(default=None, description="Opening notes")
 
 
 class ShiftCloseRequest(BaseModel):
     """Shift closing request"""
     
     employee_id: str = Field(..., description="Employee ID")
-    cash_counted: float = Field(..., ge=0, description="Counted cash amount")
+    cash_counted: Decimal = Field(..., ge=0, decimal_places=2, description="Counted cash amount")
     notes: Optional[str] = Field(default=None, description="Closing notes")
 
 
@@ -71,10 +73,10 @@ class ShiftResponse(BaseModel):
     closed_by: Optional[str] = Field(..., description="Closing employee ID")
     open_at: datetime = Field(..., description="Opening timestamp")
     close_at: Optional[datetime] = Field(..., description="Closing timestamp")
-    cash_open: float = Field(..., description="Opening cash amount")
-    cash_counted: Optional[float] = Field(..., description="Counted cash amount")
-    cash_expected: Optional[float] = Field(..., description="Expected cash amount")
-    cash_diff: Optional[float] = Field(..., description="Cash difference")
+    cash_open: Decimal = Field(..., description="Opening cash amount")
+    cash_counted: Optional[Decimal] = Field(..., description="Counted cash amount")
+    cash_expected: Optional[Decimal] = Field(..., description="Expected cash amount")
+    cash_diff: Optional[Decimal] = Field(..., description="Cash difference")
     status: ShiftStatus = Field(..., description="Shift status")
     totals: ShiftTotals = Field(..., description="Shift totals")
     notes: Optional[str] = Field(..., description="Shift notes")
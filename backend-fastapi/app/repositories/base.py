@@ -104,6 +104,31 @@ class BaseRepository(Generic[T], LoggerMixin):
             self.logger.error("Error getting multiple documents", error=str(e), query=query)
             raise
     
+    async def get_many_raw(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[List[tuple]] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get multiple documents as raw dicts, without model validation"""
+        try:
+            if query is None:
+                query = {}
+            
+            cursor = self.collection.find(query, projection)
+            
+            if sort:
+                cursor = cursor.sort(sort)
+            
+            cursor = cursor.skip(skip).limit(limit)
+            return await cursor.to_list(length=limit)
+            
+        except Exception as e:
+            self.logger.error("Error getting multiple raw documents", error=str(e), query=query)
+            raise
+    
     async def update_by_id(
         self,
         document_id: str,
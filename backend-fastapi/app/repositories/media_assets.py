@@ -116,6 +116,25 @@ class MediaAssetRepository:
         except Exception as e:
             raise ValidationError(f"Failed to find duplicate asset: {str(e)}")
     
+    async def find_processed_asset_by_hash(
+        self, 
+        hash_sha256: str, 
+        tenant_id: str,
+        exclude_asset_id: Optional[str] = None
+    ) -> Optional[MediaAsset]:
+        """Find an asset with the same content whose variants are already generated"""
+        try:
+            asset = await MediaAsset.find_one(
+                MediaAsset.hash_sha256 == hash_sha256,
+                MediaAsset.tenant_id == tenant_id,
+                MediaAsset.processing_status == "completed",
+                MediaAsset.asset_id != exclude_asset_id,
+                MediaAsset.deleted_at == None
+            )
+            return asset
+        except Exception as e:
+            raise ValidationError(f"Failed to find processed asset: {str(e)}")
+    
     async def update_processing_status(
         self, 
         asset_id: str, 
@@ -1,6 +1,7 @@
 """
 Reports Repository
 """
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import structlog
@@ -46,6 +47,48 @@ class ReportRepository(BaseRepository, LoggerMixin):
         """Create a new audit log"""
         return await self.create(audit_log)
     
+    async def get_suspicious_activities(
+        self,
+        store_id: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """Get fraud/suspicious event counts and the most recent events in one round-trip"""
+        pipeline = [
+            {
+                "$match": {
+                    "store_id": store_id,
+                    "event_type": {"$in": ["fraud_detected", "suspicious_activity"]},
+                    "timestamp": {"$gte": from_date, "$lte": to_date}
+                }
+            },
+            {
+                "$facet": {
+                    "counts": [
+                        {"$group": {"_id": "$event_type", "count": {"$sum": 1}}}
+                    ],
+                    "recent": [
+                        {"$sort": {"timestamp": -1}},
+                        {"$limit": limit},
+                        {
+                            "$project": {
+                                "_id": 0,
+                                "id": {"$toString": "$_id"},
+                                "event_type": 1,
+                                "description": 1,
+                                "timestamp": 1,
+                                "device_id": 1
+                            }
+                        }
+                    ]
+                }
+            }
+        ]
+        
+        result = await self.collection.aggregate(pipeline).to_list(1)
+        return result[0] if result else {"counts": [], "recent": []}
+    
     # Sales Reports
     async def get_sales_report(self, store_id: str, start_date: str, end_date: str) -> Dict[str, Any]:
         """Get sales report"""
@@ -1,8 +1,10 @@
 """
 Sales Repository
 """
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
 import structlog
 
 from app.repositories.base import BaseRepository
@@ -20,6 +22,7 @@ class SalesRepository(BaseRepository, LoggerMixin):
         self.sale_items_collection = db["sale_items"]
         self.refunds_collection = db["refunds"]
         self.reprints_collection = db["reprints"]
+        self.daily_rollups_collection = db["sales_daily_rollups"]
     
     # Sale methods
     async def get_sale_by_id(self, sale_id: str) -> Optional[Sale]:
@@ -65,6 +68,19 @@ class SalesRepository(BaseRepository, LoggerMixin):
         sale_item.id = doc.inserted_id
         return sale_item
     
+    async def create_sale_items_bulk(self, sale_items: List[SaleItem]) -> List[SaleItem]:
+        """Create sale items in a single round-trip"""
+        if not sale_items:
+            return sale_items
+        
+        result = await self.sale_items_collection.insert_many(
+            [sale_item.dict() for sale_item in sale_items],
+            ordered=False
+        )
+        for sale_item, inserted_id in zip(sale_items, result.inserted_ids):
+            sale_item.id = inserted_id
+        return sale_items
+    
     # Refund methods
     async def get_refunds_by_sale(self, sale_id: str) -> List[Refund]:
         """Get refunds by sale ID"""
@@ -142,3 +158,102 @@ class SalesRepository(BaseRepository, LoggerMixin):
         ]
         
         return await self.collection.aggregate(pipeline).to_list(limit)
+    
+    async def aggregate_sales_report(
+        self, 
+        store_id: str, 
+        from_date: datetime, 
+        to_date: datetime,
+        skip_from: Optional[datetime] = None,
+        skip_to: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Get sales count and total per payment method for a date range,
+        leaving out sales in [skip_from, skip_to) when given"""
+        if skip_from and skip_to:
+            match = {
+                "$or": [
+                    {"store_id": store_id, "timestamp": {"$gte": from_date, "$lt": skip_from}},
+                    {"store_id": store_id, "timestamp": {"$gte": skip_to, "$lte": to_date}}
+                ]
+            }
+        else:
+            match = {
+                "store_id": store_id,
+                "timestamp": {"$gte": from_date, "$lte": to_date}
+            }
+        
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": "$payment_method",
+                    "count": {"$sum": 1},
+                    "total": {"$sum": "$grand_total"}
+                }
+            }
+        ]
+        
+        return await self.collection.aggregate(pipeline).to_list(None)
+    
+    # Daily rollup methods
+    async def get_daily_rollups(self, store_id: str, from_day: str, to_day: str) -> List[Dict[str, Any]]:
+        """Get rebuilt daily rollups for an inclusive YYYY-MM-DD range"""
+        cursor = self.daily_rollups_collection.find(
+            {"store_id": store_id, "date": {"$gte": from_day, "$lte": to_day}, "rebuilt": True},
+            projection={"_id": 0}
+        )
+        return await cursor.to_list(None)
+    
+    async def rebuild_daily_rollups(self, store_id: str, from_date: datetime, to_date: datetime) -> None:
+        """Recompute daily rollups from raw sales for the whole days in [from_date, to_date)
+        and mark them rebuilt; only pass days that are already closed"""
+        pipeline = [
+            {
+                "$match": {
+                    "store_id": store_id,
+                    "timestamp": {"$gte": from_date, "$lt": to_date}
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+                        "payment_method": "$payment_method"
+                    },
+                    "count": {"$sum": 1},
+                    "total": {"$sum": "$grand_total"}
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$_id.date",
+                    "total_sales": {"$sum": "$total"},
+                    "transaction_count": {"$sum": "$count"},
+                    "payment_methods": {
+                        "$push": {
+                            "k": "$_id.payment_method",
+                            "v": {"count": "$count", "total": "$total"}
+                        }
+                    }
+                }
+            },
+            {"$project": {"total_sales": 1, "transaction_count": 1, "payment_methods": {"$arrayToObject": "$payment_methods"}}}
+        ]
+        
+        days_with_sales = {doc.pop("_id"): doc async for doc in self.collection.aggregate(pipeline)}
+        
+        # Every day is replaced, so days without sales get an empty rollup and
+        # whatever increments landed before the rebuild are overwritten
+        empty = {"total_sales": 0.0, "transaction_count": 0, "payment_methods": {}}
+        days = (to_date - from_date).days
+        requests = []
+        for offset in range(days):
+            date = (from_date + timedelta(days=offset)).strftime("%Y-%m-%d")
+            totals = days_with_sales.get(date, empty)
+            requests.append(ReplaceOne(
+                {"store_id": store_id, "date": date},
+                {"store_id": store_id, "date": date, **totals, "rebuilt": True},
+                upsert=True
+            ))
+        if requests:
+            await self.daily_rollups_collection.bulk_write(requests, ordered=False)
@@ -1,7 +1,8 @@
 """
 Shifts Repository
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import structlog
 
@@ -17,6 +18,7 @@ class ShiftRepository(BaseRepository, LoggerMixin):
     
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, "shifts")
+        self.sales_collection = db["sales"]
     
     # Shift methods
     async def get_shift_by_id(self, shift_id: str) -> Optional[Shift]:
@@ -41,6 +43,14 @@ class ShiftRepository(BaseRepository, LoggerMixin):
         })
         return Shift(**doc) if doc else None
     
+    async def get_current_shift_by_employee(self, employee_id: str) -> Optional[Shift]:
+        """Get the open shift for employee (served by the partial open-shift index)"""
+        doc = await self.collection.find_one({
+            "opened_by": employee_id,
+            "status": ShiftStatus.OPEN.value
+        })
+        return Shift(**doc) if doc else None
+    
     async def get_shifts_by_status(self, status: ShiftStatus, store_id: str, skip: int = 0, limit: int = 100) -> List[Shift]:
         """Get shifts by status"""
         cursor = self.collection.find({"status": status.value, "store_id": store_id}).skip(skip).limit(limit)
@@ -66,6 +76,36 @@ class ShiftRepository(BaseRepository, LoggerMixin):
         """Delete shift"""
         return await self.delete_by_id(shift_id)
     
+    async def get_shift_totals(self, shift_id: str) -> Tuple[float, float, float]:
+        """Get (total_sales, cash_sales, cash_refunds) for a shift in a single aggregate;
+        total_sales covers every tender, the cash figures only cash payments"""
+        is_cash = {"$eq": ["$payment_method", "cash"]}
+        pipeline = [
+            {
+                "$match": {
+                    "shift_id": shift_id,
+                    "status": {"$ne": "cancelled"}
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    "total_sales": {"$sum": "$grand_total"},
+                    "cash_sales": {"$sum": {"$cond": [is_cash, "$grand_total", 0]}},
+                    "cash_refunds": {
+                        "$sum": {
+                            "$cond": [{"$and": [is_cash, {"$eq": ["$status", "refunded"]}]}, "$grand_total", 0]
+                        }
+                    }
+                }
+            }
+        ]
+        
+        result = await self.sales_collection.aggregate(pipeline).to_list(1)
+        if not result:
+            return 0, 0, 0
+        return result[0]["total_sales"], result[0]["cash_sales"], result[0]["cash_refunds"]
+    
     # Shift management methods
     async def start_shift(self, shift_id: str, employee_id: str, store_id: str) -> Optional[Shift]:
         """Start a shift"""
@@ -154,3 +194,29 @@ class ShiftRepository(BaseRepository, LoggerMixin):
             "total_hours": 0,
             "avg_duration": 0
         }
+    
+    async def aggregate_shifts_report(
+        self, 
+        store_id: str, 
+        from_date: datetime, 
+        to_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Get shift count, sales and duration per employee for a date range"""
+        pipeline = [
+            {
+                "$match": {
+                    "store_id": store_id,
+                    "timestamp": {"$gte": from_date, "$lte": to_date}
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$employee_id",
+                    "shifts": {"$sum": 1},
+                    "sales": {"$sum": {"$ifNull": ["$total_sales", 0]}},
+                    "duration": {"$sum": {"$ifNull": ["$duration_minutes", 0]}}
+                }
+            }
+        ]
+        
+        return await self.collection.aggregate(pipeline).to_list(None)
@@ -1,6 +1,7 @@
 """
 Tickets Repository
 """
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import structlog
@@ -137,3 +138,30 @@ class TicketRepository(BaseRepository, LoggerMixin):
         ]
         
         return await self.collection.aggregate(pipeline).to_list(24)
+    
+    async def aggregate_tickets_report(
+        self, 
+        store_id: str, 
+        from_date: datetime, 
+        to_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Get issued and redeemed ticket counts per package for a date range"""
+        pipeline = [
+            {
+                "$match": {
+                    "store_id": store_id,
+                    "timestamp": {"$gte": from_date, "$lte": to_date}
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$package_id",
+                    "issued": {"$sum": 1},
+                    "redeemed": {
+                        "$sum": {"$cond": [{"$eq": ["$status", "redeemed"]}, 1, 0]}
+                    }
+                }
+            }
+        ]
+        
+        return await self.collection.aggregate(pipeline).to_list(None)
@@ -1,6 +1,7 @@
 """
 Media API Router for file upload and management
 """
+import asyncio
 from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
@@ -157,11 +158,11 @@ async def complete_upload(
         media_repo = MediaAssetRepository(db)
         
         # Check if file exists in storage
-        if not storage_service.file_exists(request.storage_key):
+        if not await asyncio.to_thread(storage_service.file_exists, request.storage_key):
             raise HTTPException(status_code=404, detail="File not found in storage")
         
         # Get file info from storage
-        file_info = storage_service.get_file_info(request.storage_key)
+        file_info = await asyncio.to_thread(storage_service.get_file_info, request.storage_key)
         if not file_info:
             raise HTTPException(status_code=500, detail="Failed to get file information")
         
@@ -169,22 +170,9 @@ async def complete_upload(
         # Note: In a real implementation, you'd download and validate the file
         # For now, we'll trust the storage metadata
         
-        # Calculate file hash (you'd need to download the file for this)
-        # hash_sha256 = storage_service.calculate_file_hash(file_obj)
-        
-        # Get image dimensions if it's an image
+        # Hash, dimensions and dominant color are filled in by the background
+        # processing task, which reads the object once via process_upload
         width, height = None, None
-        dominant_color = None
-        
-        if file_info['content_type'].startswith('image/'):
-            # Download file to get dimensions and dominant color
-            # In production, you might want to do this asynchronously
-            try:
-                # This is a simplified version - in practice you'd download the file
-                # and use storage_service.get_image_dimensions() and extract_dominant_color()
-                pass
-            except Exception:
-                pass  # Continue without dimensions if extraction fails
         
         # For now, we'll need to store the presign request data somewhere
         # In a real implementation, you'd store this temporarily or pass it through
@@ -201,7 +189,7 @@ async def complete_upload(
             bytes=file_info['size'],
             width=width,
             height=height,
-            hash_sha256="temp_hash",  # You'd calculate this from the actual file
+            hash_sha256="temp_hash",  # Replaced by background processing
             storage_key=request.storage_key,
             acl=ACLType.PUBLIC,
             processing_status="pending"
@@ -259,7 +247,7 @@ async def list_assets(
                 if asset.acl == ACLType.PUBLIC:
                     url = storage_service.get_public_url(variant_data.storage_key)
                 else:
-                    url = storage_service.generate_presigned_download_url(
+                    url = await storage_service.get_cached_download_url(
                         variant_data.storage_key
                     )
                 
@@ -323,7 +311,7 @@ async def get_asset(
             if asset.acl == ACLType.PUBLIC:
                 url = storage_service.get_public_url(variant_data.storage_key)
             else:
-                url = storage_service.generate_presigned_download_url(
+                url = await storage_service.get_cached_download_url(
                     variant_data.storage_key
                 )
             
@@ -388,12 +376,14 @@ async def delete_asset(
         
         # Delete from storage
         try:
-            # Delete original file
-            storage_service.delete_file(asset.storage_key)
-            
-            # Delete variants
-            for variant in asset.variants.values():
-                storage_service.delete_file(variant.storage_key)
+            # Delete original file and variants
+            await asyncio.gather(
+                asyncio.to_thread(storage_service.delete_file, asset.storage_key),
+                *(
+                    asyncio.to_thread(storage_service.delete_file, variant.storage_key)
+                    for variant in asset.variants.values()
+                )
+            )
         except Exception as e:
             # Log error but continue with soft delete
             print(f"Failed to delete files from storage: {str(e)}")
@@ -443,7 +433,7 @@ async def get_product_images(
                     if asset.acl == ACLType.PUBLIC:
                         url = storage_service.get_public_url(variant_data.storage_key)
                     else:
-                        url = storage_service.generate_presigned_download_url(
+                        url = await storage_service.get_cached_download_url(
                             variant_data.storage_key
                         )
                     
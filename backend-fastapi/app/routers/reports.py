@@ -117,3 +117,30 @@ async def get_fraud_report(
                 "message": "Failed to generate fraud report"
             }
         )
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    current_user,
+    from_date: Optional[datetime] = Query(default=None),
+    to_date: Optional[datetime] = Query(default=None),
+    report_service: ReportService = Depends(get_report_service)
+) -> Dict[str, Any]:
+    """Get all dashboard reports in one request"""
+    
+    try:
+        result = await report_service.get_dashboard(
+            user=current_user,
+            from_date=from_date,
+            to_date=to_date
+        )
+        return {"data": result}
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "E_INTERNAL_ERROR",
+                "message": "Failed to generate dashboard reports"
+            }
+        )
@@ -26,6 +26,13 @@ from app.utils.logging import LoggerMixin
 
 logger = structlog.get_logger(__name__)
 
+# Capabilities granted to a device at enrollment, keyed by device type
+_DEVICE_CAPABILITIES = {
+    "POS": ("sales", "tickets", "reports", "settings"),
+    "GATE": ("tickets", "validation"),
+    "KIOSK": ("tickets", "validation", "sales"),
+}
+
 
 class EnrollmentService(LoggerMixin):
     """Enrollment service for device pairing"""
@@ -82,9 +89,9 @@ class EnrollmentService(LoggerMixin):
     
     def _create_manual_key(self, enroll_token: str) -> str:
         """Create a simple 5-digit manual key"""
-        import random
-        # Generate a simple 5-digit code (00000-99999)
-        manual_key = f"{random.randint(0, 99999):05d}"
+        # Generate a 5-digit code (00000-99999) from the CSPRNG; pairing keys
+        # must not be predictable from earlier outputs
+        manual_key = f"{secrets.randbelow(100000):05d}"
         
         logger.debug("Created 5-digit manual key", 
                     enrollment_token=enroll_token[:8] + "...",
@@ -122,10 +129,6 @@ class EnrollmentService(LoggerMixin):
         
         # Generate 5-digit manual key
         manual_key = self._create_manual_key(enroll_token)
-        logger.info("Generated manual key", manual_key=manual_key, enroll_token=enroll_token[:8] + "...")
-        
-        # Log the manual key that will be sent to Admin UI
-        logger.info("Manual key for Admin UI", manual_key=manual_key, will_send_to_ui=True)
         
         # Calculate expiration (60 seconds for quick pairing)
         expires_at = datetime.utcnow() + timedelta(minutes=1)
@@ -145,10 +148,7 @@ class EnrollmentService(LoggerMixin):
         
         # Save to database
         await self.enrollment_repo.create_enroll_token(enroll_token_doc)
-        logger.info("Saved enrollment token to database", 
-                   manual_key=manual_key, 
-                   token=enroll_token[:8] + "...",
-                   expires_at=expires_at)
+        logger.debug("Saved enrollment token to database", expires_at=expires_at)
         
         # Create pairing payload
         payload = PairingPayload(
@@ -166,7 +166,6 @@ class EnrollmentService(LoggerMixin):
         # Generate different formats
         qr_payload = self._encode_qr_payload(payload)
         deep_link = self._create_deep_link(payload)
-        manual_key = self._create_manual_key(enroll_token)
         
         logger.info("Generated pairing token", 
                    enroll_token=enroll_token[:8] + "...",
@@ -188,17 +187,10 @@ class EnrollmentService(LoggerMixin):
         
         # Check if the request contains a manual key and convert it
         enroll_token = request.enroll_token
-        logger.info("Processing enrollment request", 
-                   enroll_token=enroll_token[:10] + "...",
-                   is_manual_key=enroll_token.isdigit() and len(enroll_token) == 5)
+        is_manual_key = len(enroll_token) == 5 and enroll_token.isdecimal()
+        logger.debug("Processing enrollment request", is_manual_key=is_manual_key)
         
-        # Add debug logging to see the full manual key
-        if enroll_token.isdigit() and len(enroll_token) == 5:
-            logger.info("Full manual key received", manual_key=enroll_token)
-        
-        if enroll_token.isdigit() and len(enroll_token) == 5:
-            logger.info("Detected 5-digit manual key, looking up enrollment token", 
-                       manual_key=enroll_token)
+        if is_manual_key:
             # Use the new method to find enrollment token by manual key
             enroll_token_doc = await self.enrollment_repo.get_enroll_token_by_manual_key(enroll_token)
             if not enroll_token_doc:
@@ -213,9 +205,7 @@ class EnrollmentService(LoggerMixin):
                     )
             # Update enroll_token to the actual token from the database
             enroll_token = enroll_token_doc.token
-            logger.info("Found enrollment token for manual key", 
-                       manual_key=enroll_token,
-                       actual_token=enroll_token[:10] + "...")
+            logger.debug("Found enrollment token for manual key")
         else:
             # Get enrollment token directly
             enroll_token_doc = await self.enrollment_repo.get_enroll_token(enroll_token)
@@ -302,12 +292,7 @@ class EnrollmentService(LoggerMixin):
     
     def _get_device_capabilities(self, device_type: str) -> list[str]:
         """Get device capabilities based on type"""
-        capabilities_map = {
-            "POS": ["sales", "tickets", "reports", "settings"],
-            "GATE": ["tickets", "validation"],
-            "KIOSK": ["tickets", "validation", "sales"]
-        }
-        return capabilities_map.get(device_type, ["basic"])
+        return list(_DEVICE_CAPABILITIES.get(device_type, ("basic",)))
     
     async def revoke_token(self, token: str, revoked_by: str) -> bool:
         """Revoke an enrollment token"""
@@ -22,72 +22,85 @@ class ImageProcessingService:
         self, 
         asset_id: str, 
         storage_key: str, 
-        tenant_id: str
+        tenant_id: str,
+        original_data: Optional[bytes] = None
     ) -> Dict[str, ImageVariant]:
         """Generate image variants for an asset"""
         try:
-            # Download original image from storage
-            original_data = await self._download_image(storage_key)
+            # Download original image from storage unless the caller already has it
+            if original_data is None:
+                original_data = await self.download_image(storage_key)
             if not original_data:
                 raise ProcessingError("Failed to download original image")
             
-            variants = {}
-            
-            # Process each variant size
+            # Encode each variant size
+            encoded = []
             for variant_name, size_config in self.variant_sizes.items():
-                variant = await self._create_variant(
+                result = await self._create_variant(
                     original_data,
                     variant_name,
                     size_config['width'],
                     size_config['height'],
-                    asset_id,
-                    storage_key,
-                    tenant_id
+                    storage_key
                 )
                 
-                if variant:
-                    variants[variant_name] = variant
+                if result:
+                    encoded.append((variant_name, *result))
+            
+            # Upload all variants concurrently over the shared S3 connection pool
+            uploaded = await asyncio.gather(*[
+                asyncio.to_thread(
+                    storage_service.upload_file,
+                    io.BytesIO(variant_data),
+                    variant.storage_key,
+                    'image/webp',
+                    {
+                        'variant': variant_name,
+                        'asset_id': asset_id,
+                        'tenant_id': tenant_id
+                    }
+                )
+                for variant_name, variant, variant_data in encoded
+            ])
             
-            return variants
+            return {
+                variant_name: variant
+                for (variant_name, variant, _), success in zip(encoded, uploaded)
+                if success
+            }
             
         except Exception as e:
             raise ProcessingError(f"Failed to generate variants: {str(e)}")
     
-    async def _download_image(self, storage_key: str) -> Optional[bytes]:
+    async def download_image(self, storage_key: str) -> Optional[bytes]:
         """Download image from storage"""
         try:
-            response = storage_service.s3_client.get_object(
-                Bucket=storage_service.bucket_name,
-                Key=storage_key
-            )
-            return response['Body'].read()
+            return await asyncio.to_thread(self._download_image_sync, storage_key)
         except Exception:
             return None
     
+    def _download_image_sync(self, storage_key: str) -> bytes:
+        """Fetch and read the whole object; blocking, so run it off the event loop"""
+        response = storage_service.s3_client.get_object(
+            Bucket=storage_service.bucket_name,
+            Key=storage_key
+        )
+        return response['Body'].read()
+    
     async def _create_variant(
         self,
         original_data: bytes,
         variant_name: str,
         target_width: int,
         target_height: int,
-        asset_id: str,
-        base_storage_key: str,
-        tenant_id: str
-    ) -> Optional[ImageVariant]:
-        """Create a single image variant"""
+        base_storage_key: str
+    ) -> Optional[Tuple[ImageVariant, bytes]]:
+        """Create a single image variant and return it with its encoded bytes"""
         try:
             # Load original image
             with Image.open(io.BytesIO(original_data)) as img:
                 # Convert to RGB if necessary (for JPEG output)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background for transparent images
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
+                img = self._to_rgb(img)
                 
                 # Calculate resize dimensions maintaining aspect ratio
                 img_width, img_height = img.size
@@ -101,7 +114,13 @@ class ImageProcessingService:
                 if scale < 1.0:
                     new_width = int(img_width * scale)
                     new_height = int(img_height * scale)
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                    # reducing_gap pre-shrinks with a cheap box filter before LANCZOS,
+                    # which makes large downscales several times faster
+                    img = img.resize(
+                        (new_width, new_height),
+                        Image.Resampling.LANCZOS,
+                        reducing_gap=3.0
+                    )
                 
                 # For thumbnails, crop to exact size if needed
                 if variant_name == 'thumb' and (img.width != target_width or img.height != target_height):
@@ -120,7 +139,6 @@ class ImageProcessingService:
                     optimize=True
                 )
                 
-                # Upload variant to storage
                 variant_data = output_buffer.getvalue()
                 variant_storage_key = storage_service.generate_variant_storage_key(
                     base_storage_key,
@@ -128,33 +146,39 @@ class ImageProcessingService:
                     'webp'
                 )
                 
-                # Upload the variant
-                variant_buffer = io.BytesIO(variant_data)
-                success = storage_service.upload_file(
-                    variant_buffer,
-                    variant_storage_key,
-                    'image/webp',
-                    metadata={
-                        'variant': variant_name,
-                        'asset_id': asset_id,
-                        'tenant_id': tenant_id
-                    }
+                # Uploading is batched by the caller
+                variant = ImageVariant(
+                    storage_key=variant_storage_key,
+                    width=img.width,
+                    height=img.height,
+                    bytes=len(variant_data),
+                    format='webp'
                 )
-                
-                if success:
-                    return ImageVariant(
-                        storage_key=variant_storage_key,
-                        width=img.width,
-                        height=img.height,
-                        bytes=len(variant_data),
-                        format='webp'
-                    )
-                
-                return None
+                return variant, variant_data
                 
         except Exception as e:
             raise ProcessingError(f"Failed to create variant {variant_name}: {str(e)}")
     
+    def _to_rgb(self, img: Image.Image) -> Image.Image:
+        """Convert image to RGB, flattening transparency onto white"""
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        
+        if img.mode == 'RGBA':
+            alpha = img.getchannel('A')
+            # Fully opaque images need no composite, just drop the alpha band
+            if alpha.getextrema()[0] == 255:
+                return img.convert('RGB')
+            
+            # Create white background for transparent images
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=alpha)
+            return background
+        
+        if img.mode != 'RGB':
+            return img.convert('RGB')
+        return img
+    
     def _strip_exif(self, img: Image.Image) -> Image.Image:
         """Strip EXIF data from image"""
         try:
@@ -176,14 +200,7 @@ class ImageProcessingService:
         try:
             with Image.open(io.BytesIO(image_data)) as img:
                 # Convert to RGB
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
+                img = self._to_rgb(img)
                 
                 # Create thumbnail
                 img.thumbnail(size, Image.Resampling.LANCZOS)
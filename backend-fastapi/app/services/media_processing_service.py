@@ -2,6 +2,7 @@
 Media Processing Service for background tasks
 """
 import asyncio
+import io
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
@@ -10,9 +11,10 @@ from ..repositories.media_assets import MediaAssetRepository
 from ..services.image_processing_service import image_processing_service
 from ..services.storage_service import storage_service
 from ..utils.errors import ProcessingError
+from ..utils.logging import LoggerMixin
 
 
-class MediaProcessingService:
+class MediaProcessingService(LoggerMixin):
     """Service for processing media assets in the background"""
     
     def __init__(self, media_repo: MediaAssetRepository):
@@ -30,7 +32,7 @@ class MediaProcessingService:
             await self.media_repo.update_processing_status(asset_id, "processing")
             
             # Check if file exists in storage
-            if not storage_service.file_exists(asset.storage_key):
+            if not await asyncio.to_thread(storage_service.file_exists, asset.storage_key):
                 await self.media_repo.update_processing_status(
                     asset_id, 
                     "failed", 
@@ -38,13 +40,37 @@ class MediaProcessingService:
                 )
                 return False
             
-            # Generate variants
-            variants = await image_processing_service.generate_variants(
-                asset_id,
-                asset.storage_key,
-                tenant_id
+            original_data = await image_processing_service.download_image(asset.storage_key)
+            if not original_data:
+                raise ProcessingError("Failed to download original image")
+            
+            # Hash and image metadata come from one pass over the original
+            upload_info = await asyncio.to_thread(
+                storage_service.process_upload, io.BytesIO(original_data)
+            )
+            asset.hash_sha256 = upload_info.hash_sha256
+            asset.width = upload_info.width
+            asset.height = upload_info.height
+            asset.dominant_color = upload_info.dominant_color
+            
+            # Identical uploads share a content hash; reuse their variants
+            # instead of decoding, resizing and re-encoding the same bytes
+            duplicate = await self.media_repo.find_processed_asset_by_hash(
+                asset.hash_sha256,
+                tenant_id,
+                exclude_asset_id=asset_id
             )
             
+            if duplicate and duplicate.variants:
+                variants = await self._copy_variants(duplicate, asset.storage_key)
+            else:
+                variants = await image_processing_service.generate_variants(
+                    asset_id,
+                    asset.storage_key,
+                    tenant_id,
+                    original_data=original_data
+                )
+            
             # Update asset with variants
             asset.variants = variants
             asset.processing_status = "completed"
@@ -63,7 +89,42 @@ class MediaProcessingService:
             )
             raise ProcessingError(f"Failed to process asset {asset_id}: {str(e)}")
     
-    async def process_pending_assets(self, tenant_id: str, limit: int = 10) -> int:
+    async def _copy_variants(
+        self, 
+        source: MediaAsset, 
+        storage_key: str
+    ) -> Dict[str, ImageVariant]:
+        """Copy a processed asset's variants under another asset's storage key"""
+        variants = {
+            variant_name: variant.model_copy(update={
+                "storage_key": storage_service.generate_variant_storage_key(
+                    storage_key,
+                    variant_name,
+                    variant.format
+                )
+            })
+            for variant_name, variant in source.variants.items()
+        }
+        
+        # Server-side copies so each asset owns its files and can be deleted independently
+        await asyncio.gather(*[
+            asyncio.to_thread(
+                storage_service.copy_file,
+                source.variants[variant_name].storage_key,
+                variant.storage_key
+            )
+            for variant_name, variant in variants.items()
+        ])
+        
+        return variants
+    
+    async def process_pending_assets(
+        self, 
+        tenant_id: str, 
+        limit: int = 10,
+        concurrency: int = 8,
+        timeout: float = 60
+    ) -> int:
         """Process pending assets"""
         try:
             pending_assets = await self.media_repo.get_assets_by_status(
@@ -72,18 +133,34 @@ class MediaProcessingService:
                 limit
             )
             
-            processed_count = 0
-            for asset in pending_assets:
-                try:
-                    success = await self.process_asset(asset.asset_id, tenant_id)
-                    if success:
-                        processed_count += 1
-                except Exception as e:
-                    # Log error but continue processing other assets
-                    print(f"Failed to process asset {asset.asset_id}: {str(e)}")
-                    continue
+            semaphore = asyncio.Semaphore(concurrency)
             
-            return processed_count
+            async def process_one(asset: MediaAsset) -> bool:
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            self.process_asset(asset.asset_id, tenant_id),
+                            timeout=timeout
+                        )
+                    except asyncio.TimeoutError:
+                        # wait_for cancelled process_asset before it could record the failure
+                        self.logger.warning("Asset processing timed out", asset_id=asset.asset_id, timeout=timeout)
+                        try:
+                            await self.media_repo.update_processing_status(
+                                asset.asset_id,
+                                "failed",
+                                f"Processing timed out after {timeout}s"
+                            )
+                        except Exception as e:
+                            self.logger.error("Failed to mark timed out asset", asset_id=asset.asset_id, error=str(e))
+                        return False
+                    except Exception as e:
+                        # Log error but continue processing other assets
+                        self.logger.error("Failed to process asset", asset_id=asset.asset_id, error=str(e))
+                        return False
+            
+            results = await asyncio.gather(*[process_one(asset) for asset in pending_assets])
+            return sum(1 for success in results if success)
             
         except Exception as e:
             raise ProcessingError(f"Failed to process pending assets: {str(e)}")
@@ -106,10 +183,13 @@ class MediaProcessingService:
                 if asset.updated_at < cutoff_time:
                     # Delete from storage
                     try:
-                        storage_service.delete_file(asset.storage_key)
-                        # Delete variants
-                        for variant in asset.variants.values():
-                            storage_service.delete_file(variant.storage_key)
+                        await asyncio.gather(
+                            asyncio.to_thread(storage_service.delete_file, asset.storage_key),
+                            *(
+                                asyncio.to_thread(storage_service.delete_file, variant.storage_key)
+                                for variant in asset.variants.values()
+                            )
+                        )
                     except Exception:
                         pass  # Continue even if storage cleanup fails
                     
@@ -130,11 +210,14 @@ class MediaProcessingService:
                 raise ProcessingError(f"Asset {asset_id} not found")
             
             # Delete existing variants from storage
-            for variant in asset.variants.values():
-                try:
-                    storage_service.delete_file(variant.storage_key)
-                except Exception:
-                    pass  # Continue even if some deletions fail
+            # Continue even if some deletions fail
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(storage_service.delete_file, variant.storage_key)
+                    for variant in asset.variants.values()
+                ),
+                return_exceptions=True
+            )
             
             # Clear variants and reprocess
             asset.variants = {}
@@ -1,8 +1,14 @@
 """Report Service - Complete Implementation"""
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import datetime, timedelta, timezone
 
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.db.redis import redis_get, redis_set, redis_increment
 from app.repositories.reports import ReportRepository
 from app.repositories.sales import SalesRepository
 from app.repositories.shifts import ShiftRepository
@@ -10,6 +16,60 @@ from app.repositories.tickets import TicketRepository
 from app.utils.logging import LoggerMixin
 from app.utils.errors import PlayParkException, ErrorCode
 
+REPORT_CACHE_PREFIX = "report"
+
+# Fraud report label and severity per audit event type
+FRAUD_EVENT_LABELS = {
+    "fraud_detected": ("Fraud Detected", "High"),
+    "suspicious_activity": ("Suspicious Activity", "Medium")
+}
+
+
+@dataclass(slots=True)
+class _PaymentMethodTotals:
+    """Running count and total for one payment method"""
+    count: int = 0
+    total: float = 0.0
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a query datetime to the naive UTC values stored in MongoDB"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _report_cache_key(
+    report_type: str,
+    store_id: str,
+    generation: int,
+    from_date: datetime,
+    to_date: Optional[datetime]
+) -> str:
+    """Build report cache key; an open-ended range is keyed as "now" """
+    to_key = to_date.isoformat() if to_date else "now"
+    return f"{report_type}:{store_id}:{generation}:{from_date.isoformat()}:{to_key}"
+
+
+async def _report_cache_generation(report_type: str, store_id: str) -> int:
+    """Current cache generation of a store's reports; bumping it orphans older entries"""
+    generation = await redis_get(f"gen:{report_type}:{store_id}", prefix=REPORT_CACHE_PREFIX)
+    return generation or 0
+
+
+def _report_cache_ttl(to_date: datetime, today_start: datetime) -> int:
+    """Closed historical ranges cannot change, so they are cached longer"""
+    if to_date < today_start:
+        return settings.REPORT_CACHE_HISTORICAL_TTL_SECONDS
+    return settings.REPORT_CACHE_TTL_SECONDS
+
+
+async def invalidate_report_cache(store_id: str, report_types: List[str]) -> None:
+    """Drop cached reports of the given types for a store by moving them to a new
+    generation; the orphaned entries expire on their own TTL"""
+    for report_type in report_types:
+        await redis_increment(f"gen:{report_type}:{store_id}", prefix=REPORT_CACHE_PREFIX)
+
 
 class ReportService(LoggerMixin):
     def __init__(
@@ -24,57 +84,122 @@ class ReportService(LoggerMixin):
         self.shift_repo = shift_repo
         self.ticket_repo = ticket_repo
     
+    async def _aggregate_payment_methods(
+        self,
+        store_id: str,
+        from_date: datetime,
+        to_date: datetime,
+        today_start: datetime
+    ) -> Dict[str, _PaymentMethodTotals]:
+        """Sum sales per payment method, reading closed whole days from daily rollups"""
+        from_day_start = from_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        rollup_from = from_day_start if from_day_start == from_date else from_day_start + timedelta(days=1)
+        rollup_to = min(to_date.replace(hour=0, minute=0, second=0, microsecond=0), today_start)
+        
+        payment_methods = defaultdict(_PaymentMethodTotals)
+        
+        # Use the longest run of consecutive rolled-up closed days; anything
+        # outside it (partial days, days not yet rolled up) comes from raw sales
+        skip_from = skip_to = None
+        if rollup_from < rollup_to:
+            rollups = await self.sales_repo.get_daily_rollups(
+                store_id,
+                rollup_from.strftime("%Y-%m-%d"),
+                (rollup_to - timedelta(days=1)).strftime("%Y-%m-%d")
+            )
+            rollups.sort(key=lambda rollup: rollup["date"])
+            for rollup in rollups:
+                day = datetime.strptime(rollup["date"], "%Y-%m-%d")
+                if skip_to is not None and day != skip_to:
+                    break
+                if skip_from is None:
+                    skip_from = day
+                skip_to = day + timedelta(days=1)
+                for method, data in rollup["payment_methods"].items():
+                    totals = payment_methods[method]
+                    totals.count += data["count"]
+                    totals.total += data["total"]
+        
+        if skip_from is not None:
+            buckets = await self.sales_repo.aggregate_sales_report(
+                store_id, from_date, to_date, skip_from=skip_from, skip_to=skip_to
+            )
+        else:
+            buckets = await self.sales_repo.aggregate_sales_report(store_id, from_date, to_date)
+        
+        for bucket in buckets:
+            totals = payment_methods[bucket["_id"]]
+            totals.count += bucket["count"]
+            totals.total += bucket["total"]
+        
+        return payment_methods
+    
     async def get_sales_report(self, user, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate sales report"""
-        self.logger.info("Generating sales report", user_id=user.employee_id)
+        self.logger.debug("Generating sales report", user_id=user.employee_id)
+        
+        from_date = _to_naive_utc(from_date)
+        to_date = _to_naive_utc(to_date)
         
         try:
+            now = datetime.utcnow()
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            
             # Set default date range if not provided
             if not from_date:
-                from_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                from_date = today_start
+            
+            generation = await _report_cache_generation("sales", user.store_id)
+            cache_key = _report_cache_key("sales", user.store_id, generation, from_date, to_date)
+            cached_report = await redis_get(cache_key, prefix=REPORT_CACHE_PREFIX)
+            if cached_report is not None:
+                return cached_report
+            
             if not to_date:
-                to_date = datetime.utcnow()
+                to_date = now
             
-            # Get sales data
-            sales = await self.sales_repo.get_sales_by_store_and_date_range(
-                user.store_id, from_date, to_date
-            )
+            date_range = {"from": from_date.isoformat(), "to": to_date.isoformat()}
+            
+            # Aggregate sales per payment method
+            payment_methods = await self._aggregate_payment_methods(user.store_id, from_date, to_date, today_start)
+            
+            if not payment_methods:
+                report = {
+                    "total_sales": 0.0,
+                    "total_transactions": 0,
+                    "average_transaction": 0,
+                    "payment_methods": [],
+                    "date_range": date_range
+                }
+                await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+                return report
             
             # Calculate totals
-            total_sales = sum(sale.grand_total for sale in sales)
-            total_transactions = len(sales)
-            
-            # Payment method breakdown
-            payment_methods = {}
-            for sale in sales:
-                method = sale.payment_method
-                if method not in payment_methods:
-                    payment_methods[method] = {"count": 0, "total": Decimal('0')}
-                payment_methods[method]["count"] += 1
-                payment_methods[method]["total"] += Decimal(str(sale.grand_total))
+            total_sales = sum(totals.total for totals in payment_methods.values())
+            total_transactions = sum(totals.count for totals in payment_methods.values())
             
             # Convert to list format for frontend
             payment_method_data = [
                 {
                     "name": method,
-                    "value": float(data["total"]),
-                    "count": data["count"]
+                    "value": totals.total,
+                    "count": totals.count
                 }
-                for method, data in payment_methods.items()
+                for method, totals in payment_methods.items()
             ]
             
-            return {
-                "total_sales": float(total_sales),
+            report = {
+                "total_sales": total_sales,
                 "total_transactions": total_transactions,
-                "average_transaction": float(total_sales / total_transactions) if total_transactions > 0 else 0,
+                "average_transaction": total_sales / total_transactions if total_transactions > 0 else 0,
                 "payment_methods": payment_method_data,
-                "date_range": {
-                    "from": from_date.isoformat(),
-                    "to": to_date.isoformat()
-                }
+                "date_range": date_range
             }
             
-        except Exception as e:
+            await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+            return report
+            
+        except (PyMongoError, asyncio.TimeoutError) as e:
             self.logger.error("Error generating sales report", error=str(e))
             raise PlayParkException(
                 error_code=ErrorCode.INTERNAL_ERROR,
@@ -83,56 +208,73 @@ class ReportService(LoggerMixin):
     
     async def get_shifts_report(self, user, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate shifts report"""
-        self.logger.info("Generating shifts report", user_id=user.employee_id)
+        self.logger.debug("Generating shifts report", user_id=user.employee_id)
+        
+        from_date = _to_naive_utc(from_date)
+        to_date = _to_naive_utc(to_date)
         
         try:
+            now = datetime.utcnow()
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            
             # Set default date range if not provided
             if not from_date:
-                from_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                from_date = today_start
+            
+            generation = await _report_cache_generation("shifts", user.store_id)
+            cache_key = _report_cache_key("shifts", user.store_id, generation, from_date, to_date)
+            cached_report = await redis_get(cache_key, prefix=REPORT_CACHE_PREFIX)
+            if cached_report is not None:
+                return cached_report
+            
             if not to_date:
-                to_date = datetime.utcnow()
+                to_date = now
             
-            # Get shifts data
-            shifts = await self.shift_repo.get_shifts_by_store_and_date_range(
+            date_range = {"from": from_date.isoformat(), "to": to_date.isoformat()}
+            
+            # Sum shifts, sales and duration per employee in the database
+            employee_stats = await self.shift_repo.aggregate_shifts_report(
                 user.store_id, from_date, to_date
             )
             
+            if not employee_stats:
+                report = {
+                    "total_shifts": 0,
+                    "total_sales": 0.0,
+                    "total_duration_hours": 0,
+                    "average_shift_duration": 0,
+                    "employee_stats": [],
+                    "date_range": date_range
+                }
+                await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+                return report
+            
             # Calculate totals
-            total_shifts = len(shifts)
-            total_sales = sum(shift.total_sales or 0 for shift in shifts)
-            total_duration = sum(shift.duration_minutes or 0 for shift in shifts)
-            
-            # Employee breakdown
-            employee_stats = {}
-            for shift in shifts:
-                emp_id = shift.employee_id
-                if emp_id not in employee_stats:
-                    employee_stats[emp_id] = {"shifts": 0, "sales": Decimal('0'), "duration": 0}
-                employee_stats[emp_id]["shifts"] += 1
-                employee_stats[emp_id]["sales"] += Decimal(str(shift.total_sales or 0))
-                employee_stats[emp_id]["duration"] += shift.duration_minutes or 0
+            total_shifts = sum(stats["shifts"] for stats in employee_stats)
+            total_sales = sum(stats["sales"] for stats in employee_stats)
+            total_duration = sum(stats["duration"] for stats in employee_stats)
             
-            return {
+            report = {
                 "total_shifts": total_shifts,
-                "total_sales": float(total_sales),
+                "total_sales": total_sales,
                 "total_duration_hours": total_duration / 60,
                 "average_shift_duration": total_duration / total_shifts if total_shifts > 0 else 0,
                 "employee_stats": [
                     {
-                        "employee_id": emp_id,
+                        "employee_id": stats["_id"],
                         "shifts_count": stats["shifts"],
-                        "total_sales": float(stats["sales"]),
+                        "total_sales": stats["sales"],
                         "total_duration": stats["duration"]
                     }
-                    for emp_id, stats in employee_stats.items()
+                    for stats in employee_stats
                 ],
-                "date_range": {
-                    "from": from_date.isoformat(),
-                    "to": to_date.isoformat()
-                }
+                "date_range": date_range
             }
             
-        except Exception as e:
+            await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+            return report
+            
+        except (PyMongoError, asyncio.TimeoutError) as e:
             self.logger.error("Error generating shifts report", error=str(e))
             raise PlayParkException(
                 error_code=ErrorCode.INTERNAL_ERROR,
@@ -141,55 +283,71 @@ class ReportService(LoggerMixin):
     
     async def get_tickets_report(self, user, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate tickets report"""
-        self.logger.info("Generating tickets report", user_id=user.employee_id)
+        self.logger.debug("Generating tickets report", user_id=user.employee_id)
+        
+        from_date = _to_naive_utc(from_date)
+        to_date = _to_naive_utc(to_date)
         
         try:
+            now = datetime.utcnow()
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            
             # Set default date range if not provided
             if not from_date:
-                from_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                from_date = today_start
+            
+            generation = await _report_cache_generation("tickets", user.store_id)
+            cache_key = _report_cache_key("tickets", user.store_id, generation, from_date, to_date)
+            cached_report = await redis_get(cache_key, prefix=REPORT_CACHE_PREFIX)
+            if cached_report is not None:
+                return cached_report
+            
             if not to_date:
-                to_date = datetime.utcnow()
+                to_date = now
             
-            # Get tickets data
-            issued_tickets = await self.ticket_repo.get_tickets_by_store_and_date_range(
+            date_range = {"from": from_date.isoformat(), "to": to_date.isoformat()}
+            
+            # Count issued and redeemed tickets per package in the database
+            package_stats = await self.ticket_repo.aggregate_tickets_report(
                 user.store_id, from_date, to_date
             )
             
+            if not package_stats:
+                report = {
+                    "total_issued": 0,
+                    "total_redeemed": 0,
+                    "redemption_rate": 0,
+                    "package_stats": [],
+                    "date_range": date_range
+                }
+                await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+                return report
+            
             # Calculate totals
-            total_issued = len(issued_tickets)
-            total_redeemed = sum(1 for ticket in issued_tickets if ticket.status == "redeemed")
+            total_issued = sum(stats["issued"] for stats in package_stats)
+            total_redeemed = sum(stats["redeemed"] for stats in package_stats)
             redemption_rate = (total_redeemed / total_issued * 100) if total_issued > 0 else 0
             
-            # Package breakdown
-            package_stats = {}
-            for ticket in issued_tickets:
-                package_id = ticket.package_id
-                if package_id not in package_stats:
-                    package_stats[package_id] = {"issued": 0, "redeemed": 0}
-                package_stats[package_id]["issued"] += 1
-                if ticket.status == "redeemed":
-                    package_stats[package_id]["redeemed"] += 1
-            
-            return {
+            report = {
                 "total_issued": total_issued,
                 "total_redeemed": total_redeemed,
                 "redemption_rate": round(redemption_rate, 2),
                 "package_stats": [
                     {
-                        "package_id": package_id,
+                        "package_id": stats["_id"],
                         "issued": stats["issued"],
                         "redeemed": stats["redeemed"],
                         "redemption_rate": round((stats["redeemed"] / stats["issued"] * 100) if stats["issued"] > 0 else 0, 2)
                     }
-                    for package_id, stats in package_stats.items()
+                    for stats in package_stats
                 ],
-                "date_range": {
-                    "from": from_date.isoformat(),
-                    "to": to_date.isoformat()
-                }
+                "date_range": date_range
             }
             
-        except Exception as e:
+            await redis_set(cache_key, report, expire=_report_cache_ttl(to_date, today_start), prefix=REPORT_CACHE_PREFIX)
+            return report
+            
+        except (PyMongoError, asyncio.TimeoutError) as e:
             self.logger.error("Error generating tickets report", error=str(e))
             raise PlayParkException(
                 error_code=ErrorCode.INTERNAL_ERROR,
@@ -198,58 +356,67 @@ class ReportService(LoggerMixin):
     
     async def get_fraud_report(self, user, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate fraud detection report"""
-        self.logger.info("Generating fraud report", user_id=user.employee_id)
+        self.logger.debug("Generating fraud report", user_id=user.employee_id)
+        
+        from_date = _to_naive_utc(from_date)
+        to_date = _to_naive_utc(to_date)
         
         try:
+            now = datetime.utcnow()
+            
             # Set default date range if not provided
             if not from_date:
-                from_date = datetime.utcnow() - timedelta(days=7)
+                from_date = now - timedelta(days=7)
             if not to_date:
-                to_date = datetime.utcnow()
+                to_date = now
+            
+            date_range = {"from": from_date.isoformat(), "to": to_date.isoformat()}
             
-            # Get audit logs for suspicious activities
+            # Count suspicious activities and fetch the recent ones in the database
             suspicious_activities = await self.report_repo.get_suspicious_activities(
-                user.store_id, from_date, to_date
+                user.store_id, from_date, to_date, limit=10
             )
             
-            # Analyze patterns
-            fraud_indicators = []
-            blocked_attempts = 0
-            
-            for activity in suspicious_activities:
-                if activity.event_type == "fraud_detected":
-                    blocked_attempts += 1
-                    fraud_indicators.append({
-                        "id": activity.id,
-                        "type": "Fraud Detected",
-                        "severity": "High",
-                        "description": activity.description,
-                        "timestamp": activity.timestamp,
-                        "device_id": activity.device_id
-                    })
-                elif activity.event_type == "suspicious_activity":
-                    fraud_indicators.append({
-                        "id": activity.id,
-                        "type": "Suspicious Activity",
-                        "severity": "Medium",
-                        "description": activity.description,
-                        "timestamp": activity.timestamp,
-                        "device_id": activity.device_id
-                    })
+            event_counts = {bucket["_id"]: bucket["count"] for bucket in suspicious_activities["counts"]}
             
-            return {
-                "suspicious_activities": len(fraud_indicators),
-                "blocked_attempts": blocked_attempts,
-                "activities": fraud_indicators[:10],  # Limit to recent 10
-                "date_range": {
-                    "from": from_date.isoformat(),
-                    "to": to_date.isoformat()
+            fraud_indicators = [
+                {
+                    "id": activity["id"],
+                    "type": FRAUD_EVENT_LABELS[activity["event_type"]][0],
+                    "severity": FRAUD_EVENT_LABELS[activity["event_type"]][1],
+                    "description": activity.get("description"),
+                    "timestamp": activity["timestamp"],
+                    "device_id": activity.get("device_id")
                 }
+                for activity in suspicious_activities["recent"]
+            ]
+            
+            return {
+                "suspicious_activities": sum(event_counts.values()),
+                "blocked_attempts": event_counts.get("fraud_detected", 0),
+                "activities": fraud_indicators,
+                "date_range": date_range
             }
             
-        except Exception as e:
+        except (PyMongoError, asyncio.TimeoutError) as e:
             self.logger.error("Error generating fraud report", error=str(e))
             raise PlayParkException(
                 error_code=ErrorCode.INTERNAL_ERROR,
                 message="Failed to generate fraud report"
             )
+    
+    async def get_dashboard(self, user, from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Generate all dashboard reports concurrently"""
+        sales, shifts, tickets, fraud = await asyncio.gather(
+            self.get_sales_report(user, from_date, to_date),
+            self.get_shifts_report(user, from_date, to_date),
+            self.get_tickets_report(user, from_date, to_date),
+            self.get_fraud_report(user, from_date, to_date)
+        )
+        
+        return {
+            "sales": sales,
+            "shifts": shifts,
+            "tickets": tickets,
+            "fraud": fraud
+        }
@@ -1,15 +1,29 @@
 """
 Sales Service - Complete Implementation
 """
+import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from decimal import Decimal
+from bson import ObjectId
 
 from app.models.sales import SaleCreateRequest, RefundRequest, ReprintRequest, Sale, SaleItem
 from app.repositories.sales import SalesRepository
+from app.services.reports import invalidate_report_cache
 from app.utils.logging import LoggerMixin
 from app.utils.errors import PlayParkException, ErrorCode
 
+SALE_LIST_PROJECTION = {
+    "_id": 0,
+    "sale_id": 1,
+    "reference": 1,
+    "status": 1,
+    "subtotal": 1,
+    "grand_total": 1,
+    "payment_method": 1,
+    "timestamp": 1
+}
+
 
 class SalesService(LoggerMixin):
     """Sales service"""
@@ -36,9 +50,11 @@ class SalesService(LoggerMixin):
             grand_total = subtotal - discount_total + tax_total
             
             # Create sale object
+            now = datetime.utcnow()
+            sale_id = str(ObjectId())
             sale = Sale(
-                sale_id=f"sale_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{user.employee_id}",
-                reference=idempotency_key or f"ref_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+                sale_id=sale_id,
+                reference=idempotency_key or f"ref_{sale_id}",
                 store_id=device["store_id"],
                 employee_id=user.employee_id,
                 device_id=device["device_id"],
@@ -52,24 +68,26 @@ class SalesService(LoggerMixin):
                 amount_tendered=request.amount_tendered,
                 change=request.amount_tendered - float(grand_total),
                 notes=request.notes,
-                timestamp=datetime.utcnow()
+                timestamp=now
             )
             
             # Save sale to database
             created_sale = await self.sales_repo.create_sale(sale)
             
             # Create sale items
-            sale_items = []
-            for item in request.items:
-                sale_item = SaleItem(
+            sale_items = await self.sales_repo.create_sale_items_bulk([
+                SaleItem(
                     sale_id=created_sale.sale_id,
                     product_id=item.product_id,
                     quantity=item.quantity,
                     price=item.price,
                     total=item.price * item.quantity
                 )
-                created_item = await self.sales_repo.create_sale_item(sale_item)
-                sale_items.append(created_item)
+                for item in request.items
+            ])
+            
+            # Cached reports for this store no longer reflect the new sale
+            await invalidate_report_cache(created_sale.store_id, ["sales", "tickets"])
             
             # Return response
             return {
@@ -159,30 +177,18 @@ class SalesService(LoggerMixin):
                 if to_date:
                     query["timestamp"]["$lte"] = to_date
             
-            # Get sales from repository
-            sales = await self.sales_repo.get_many(
-                query=query,
-                skip=offset,
-                limit=limit,
-                sort=[("timestamp", -1)]  # Most recent first
+            # Get sales page and total count for pagination concurrently
+            sales_data, total_count = await asyncio.gather(
+                self.sales_repo.get_many_raw(
+                    query=query,
+                    skip=offset,
+                    limit=limit,
+                    sort=[("timestamp", -1)],  # Most recent first
+                    projection=SALE_LIST_PROJECTION
+                ),
+                self.sales_repo.count(query)
             )
             
-            # Get total count for pagination
-            total_count = await self.sales_repo.count_documents(query)
-            
-            # Format sales data
-            sales_data = []
-            for sale in sales:
-                sales_data.append({
-                    "sale_id": sale.sale_id,
-                    "reference": sale.reference,
-                    "status": sale.status,
-                    "subtotal": sale.subtotal,
-                    "grand_total": sale.grand_total,
-                    "payment_method": sale.payment_method,
-                    "timestamp": sale.timestamp
-                })
-            
             return {
                 "sales": sales_data,
                 "pagination": {
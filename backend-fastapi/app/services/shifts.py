@@ -1,13 +1,22 @@
 """Shift Service - Complete Implementation"""
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.db.mongo import open_shift_index_ready
+from app.db.redis import redis_get, redis_set, redis_delete
 from app.models.shifts import Shift, ShiftOpenRequest, ShiftCloseRequest
 from app.repositories.shifts import ShiftRepository
+from app.services.reports import invalidate_report_cache
 from app.utils.logging import LoggerMixin
 from app.utils.errors import PlayParkException, ErrorCode
 
+CURRENT_SHIFT_CACHE_PREFIX = "shift:cur"
+
 
 class ShiftService(LoggerMixin):
     def __init__(self, shift_repo: ShiftRepository):
@@ -18,28 +27,39 @@ class ShiftService(LoggerMixin):
         self.logger.info("Opening shift", user_id=user.employee_id, store_id=user.store_id)
         
         try:
-            # Check if there's already an open shift for this user
-            existing_shift = await self.shift_repo.get_current_shift_by_employee(user.employee_id)
-            if existing_shift and existing_shift.status == "open":
-                raise PlayParkException(
-                    error_code=ErrorCode.BAD_REQUEST,
-                    message="Employee already has an open shift"
-                )
+            if not open_shift_index_ready():
+                # Without the unique index nothing else stops a second open shift
+                existing_shift = await self.shift_repo.get_current_shift_by_employee(user.employee_id)
+                if existing_shift:
+                    raise PlayParkException(
+                        error_code=ErrorCode.SHIFT_ALREADY_OPEN,
+                        message="Employee already has an open shift"
+                    )
             
-            # Create new shift
+            # Create new shift; the partial unique index on open shifts
+            # rejects a second open shift for the same employee
             shift = Shift(
-                shift_id=f"shift_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{user.employee_id}",
-                tenant_id=user.tenant_id if hasattr(user, 'tenant_id') else "default",
+                # Millisecond epoch keeps IDs lexicographically sortable without strftime
+                shift_id=f"shift_{time.time_ns() // 1_000_000}_{user.employee_id}",
+                tenant_id=getattr(user, 'tenant_id', "default"),
                 store_id=user.store_id,
-                device_id=user.device_id if hasattr(user, 'device_id') else "default",
+                device_id=getattr(user, 'device_id', "default"),
                 opened_by=user.employee_id,
                 open_at=datetime.utcnow(),
                 cash_open=request.cash_open,
                 status="open",
-                notes=request.notes if hasattr(request, 'notes') else None
+                notes=request.notes
             )
             
-            created_shift = await self.shift_repo.create_shift(shift)
+            try:
+                created_shift = await self.shift_repo.create_shift(shift)
+            except DuplicateKeyError:
+                raise PlayParkException(
+                    error_code=ErrorCode.SHIFT_ALREADY_OPEN,
+                    message="Employee already has an open shift"
+                )
+            await redis_delete(user.employee_id, prefix=CURRENT_SHIFT_CACHE_PREFIX)
+            await invalidate_report_cache(created_shift.store_id, ["shifts"])
             
             return {
                 "shift_id": created_shift.shift_id,
@@ -77,11 +97,12 @@ class ShiftService(LoggerMixin):
             closing_time = datetime.utcnow()
             shift_duration = closing_time - current_shift.open_at
             
-            # Calculate totals (in real app, you'd get these from sales)
-            total_sales = Decimal('0')  # Placeholder
-            total_refunds = Decimal('0')  # Placeholder
+            # Only cash tenders end up in the drawer; card and QR sales count toward total_sales alone
+            total_sales, cash_sales, cash_refunds = await self.shift_repo.get_shift_totals(current_shift.shift_id)
+            total_sales = Decimal(str(total_sales))
+            cash_expected = current_shift.cash_open + Decimal(str(cash_sales)) - Decimal(str(cash_refunds))
             closing_cash = request.cash_counted or Decimal('0')
-            cash_difference = closing_cash - current_shift.cash_open - total_sales + total_refunds
+            cash_difference = closing_cash - cash_expected
             
             updated_shift = await self.shift_repo.update_shift(
                 current_shift.shift_id,
@@ -89,12 +110,14 @@ class ShiftService(LoggerMixin):
                     "status": "closed",
                     "close_at": closing_time,
                     "closed_by": user.employee_id,
-                    "cash_counted": float(closing_cash),
-                    "cash_expected": float(current_shift.cash_open + total_sales - total_refunds),
-                    "cash_diff": float(cash_difference),
+                    "cash_counted": closing_cash,
+                    "cash_expected": cash_expected,
+                    "cash_diff": cash_difference,
                     "notes": request.notes
                 }
             )
+            await redis_delete(current_shift.opened_by, prefix=CURRENT_SHIFT_CACHE_PREFIX)
+            await invalidate_report_cache(updated_shift.store_id, ["shifts"])
             
             return {
                 "shift_id": updated_shift.shift_id,
@@ -104,7 +127,7 @@ class ShiftService(LoggerMixin):
                 "duration_minutes": int((updated_shift.close_at - updated_shift.open_at).total_seconds() / 60),
                 "opening_cash": updated_shift.cash_open,
                 "closing_cash": updated_shift.cash_counted,
-                "total_sales": float(total_sales),
+                "total_sales": total_sales,
                 "cash_difference": updated_shift.cash_diff,
                 "notes": updated_shift.notes
             }
@@ -123,10 +146,22 @@ class ShiftService(LoggerMixin):
         self.logger.info("Getting current shift", user_id=user.employee_id)
         
         try:
-            shift = await self.shift_repo.get_current_shift_by_employee(user.employee_id)
-            
-            if not shift or shift.status != "open":
-                return None
+            # Only open shifts are cached; open/close drop the entry
+            cached_shift = await redis_get(user.employee_id, prefix=CURRENT_SHIFT_CACHE_PREFIX)
+            if cached_shift:
+                shift = Shift(**cached_shift)
+            else:
+                shift = await self.shift_repo.get_current_shift_by_employee(user.employee_id)
+                
+                if not shift or shift.status != "open":
+                    return None
+                
+                await redis_set(
+                    user.employee_id,
+                    shift.model_dump_json(exclude={"id"}),
+                    expire=settings.CURRENT_SHIFT_CACHE_TTL_SECONDS,
+                    prefix=CURRENT_SHIFT_CACHE_PREFIX
+                )
             
             return {
                 "shift_id": shift.shift_id,
@@ -2,19 +2,79 @@
 Storage Service for S3/MinIO operations
 """
 import hashlib
+import io
 import mimetypes
+import os
+import threading
+import time
+from functools import lru_cache
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, BinaryIO
 from urllib.parse import urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from PIL import Image
 import magic
 
 from ..config import settings
+from ..db.redis import redis_get, redis_set
 from ..utils.errors import ValidationError, StorageError
 
+# Shared libmagic cookie; loading the magic database is expensive and
+# python-magic serializes access to it internally
+_magic = magic.Magic(mime=True)
+
+# Uploaded objects are immutable, so HEAD results for existing objects can be
+# reused briefly; misses are never cached because presigned PUTs land without
+# passing through this process
+_HEAD_CACHE_TTL_SECONDS = 60
+_HEAD_CACHE_MAX_ENTRIES = 10_000
+
+
+@dataclass
+class UploadInfo:
+    """File metadata derived in a single pass over an upload"""
+    size: int
+    detected_mime: str
+    hash_sha256: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    dominant_color: Optional[str] = None
+
+
+def _dominant_color(img: Image.Image) -> Optional[str]:
+    """Most frequent color of an image as a hex code"""
+    # Convert to RGB if necessary
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    # Resize to small size for faster processing
+    img = img.resize((150, 150))
+    
+    # Reduce to a small palette with Pillow's C octree quantizer
+    palette_img = img.quantize(colors=8, method=Image.Quantize.FASTOCTREE)
+    colors = palette_img.getcolors()
+    if not colors:
+        return None
+    
+    # Get the most frequent palette entry
+    index = max(colors, key=lambda x: x[0])[1]
+    r, g, b = palette_img.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+@lru_cache(maxsize=512)
+def _guess_ext(suffix: str) -> str:
+    """Map a filename suffix to its canonical extension, '.bin' when unknown"""
+    mime_type = mimetypes.guess_type(f"file{suffix}")[0]
+    if mime_type is None:
+        return '.bin'
+    return mimetypes.guess_extension(mime_type) or '.bin'
+
 
 class StorageService:
     """Service for S3/MinIO storage operations"""
@@ -22,6 +82,10 @@ class StorageService:
     def __init__(self):
         self.s3_client = None
         self.bucket_name = settings.S3_BUCKET
+        # storage_key -> (expires_at, file info) for objects known to exist
+        self._head_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Storage calls run in asyncio.to_thread workers, so cache writes are serialized
+        self._head_cache_lock = threading.Lock()
         self._initialize_client()
     
     def _initialize_client(self):
@@ -34,7 +98,22 @@ class StorageService:
                 aws_secret_access_key=settings.S3_SECRET_KEY,
                 region_name=settings.S3_REGION,
                 use_ssl=settings.S3_USE_SSL,
-                verify=False if not settings.S3_USE_SSL else True
+                verify=False if not settings.S3_USE_SSL else True,
+                # Single pooled client shared by all uploads so concurrent
+                # variant uploads reuse warm keep-alive connections
+                config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                    retries={'max_attempts': 3, 'mode': 'adaptive'}
+                )
+            )
+            
+            # Large uploads are split into 8 MB parts sent in parallel
+            self._transfer_config = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=8,
+                use_threads=True
             )
             
             # Ensure bucket exists
@@ -76,7 +155,7 @@ class StorageService:
     ) -> str:
         """Generate storage key for a file"""
         # Extract file extension
-        file_ext = mimetypes.guess_extension(mimetypes.guess_type(filename)[0]) or '.bin'
+        file_ext = _guess_ext(os.path.splitext(filename)[1].lower())
         
         # Generate storage path: tenants/<tid>/<owner_type>/<owner_id>/<asset_id>/orig.ext
         storage_key = f"tenants/{tenant_id}/{owner_type}s/{owner_id}/{asset_id}/orig{file_ext}"
@@ -90,9 +169,9 @@ class StorageService:
     ) -> str:
         """Generate storage key for a variant"""
         # Replace 'orig.ext' with 'variant.format'
-        parts = base_storage_key.rsplit('/', 1)
-        if len(parts) == 2:
-            return f"{parts[0]}/{variant}.{format}"
+        idx = base_storage_key.rfind('/')
+        if idx != -1:
+            return f"{base_storage_key[:idx + 1]}{variant}.{format}"
         return f"{base_storage_key.rsplit('.', 1)[0]}/{variant}.{format}"
     
     def generate_presigned_upload_url(
@@ -150,6 +229,27 @@ class StorageService:
         except ClientError as e:
             raise StorageError(f"Failed to generate download URL: {str(e)}")
     
+    async def get_cached_download_url(
+        self, 
+        storage_key: str, 
+        expires_in: Optional[int] = None
+    ) -> str:
+        """Get a presigned download URL, reusing a cached one while it stays valid"""
+        expires_in = expires_in or settings.S3_SIGNED_URL_TTL
+        cache_key = f"{expires_in}:{storage_key}"
+        
+        url = await redis_get(cache_key, prefix="presigned")
+        if url:
+            return url
+        
+        url = self.generate_presigned_download_url(storage_key, expires_in)
+        
+        # Drop the cached URL a minute before it expires so callers always
+        # receive a URL with time left on it
+        if expires_in > 60:
+            await redis_set(cache_key, url, expire=expires_in - 60, prefix="presigned")
+        return url
+    
     def get_public_url(self, storage_key: str) -> str:
         """Get public URL for a file"""
         base_url = settings.media_base_url
@@ -179,35 +279,68 @@ class StorageService:
                 file_obj,
                 self.bucket_name,
                 storage_key,
-                ExtraArgs=extra_args
+                ExtraArgs=extra_args,
+                Config=self._transfer_config
             )
+            self._forget_file_info(storage_key)
             
             return True
             
         except ClientError as e:
             raise StorageError(f"Failed to upload file: {str(e)}")
     
+    def copy_file(self, source_key: str, storage_key: str) -> bool:
+        """Copy an existing object to a new key within the bucket"""
+        try:
+            self.s3_client.copy_object(
+                Bucket=self.bucket_name,
+                Key=storage_key,
+                CopySource={'Bucket': self.bucket_name, 'Key': source_key}
+            )
+            self._forget_file_info(storage_key)
+            return True
+        except ClientError as e:
+            raise StorageError(f"Failed to copy file: {str(e)}")
+    
     def delete_file(self, storage_key: str) -> bool:
         """Delete file from storage"""
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=storage_key)
+            self._forget_file_info(storage_key)
             return True
         except ClientError as e:
             raise StorageError(f"Failed to delete file: {str(e)}")
     
+    def _cache_file_info(self, storage_key: str, info: Dict) -> None:
+        """Remember a HEAD result, evicting expired or oldest entries when full"""
+        now = time.monotonic()
+        with self._head_cache_lock:
+            if len(self._head_cache) >= _HEAD_CACHE_MAX_ENTRIES:
+                for key, (expires_at, _) in list(self._head_cache.items()):
+                    if expires_at <= now:
+                        del self._head_cache[key]
+                if len(self._head_cache) >= _HEAD_CACHE_MAX_ENTRIES:
+                    del self._head_cache[next(iter(self._head_cache))]
+            self._head_cache[storage_key] = (now + _HEAD_CACHE_TTL_SECONDS, info)
+    
+    def _forget_file_info(self, storage_key: str) -> None:
+        """Drop a cached HEAD result after the object changed"""
+        with self._head_cache_lock:
+            self._head_cache.pop(storage_key, None)
+    
     def file_exists(self, storage_key: str) -> bool:
         """Check if file exists in storage"""
-        try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=storage_key)
-            return True
-        except ClientError:
-            return False
+        return self.get_file_info(storage_key) is not None
     
     def get_file_info(self, storage_key: str) -> Optional[Dict]:
         """Get file metadata from storage"""
+        cached = self._head_cache.get(storage_key)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
         try:
             response = self.s3_client.head_object(Bucket=self.bucket_name, Key=storage_key)
-            return {
+            info = {
                 'size': response['ContentLength'],
                 'last_modified': response['LastModified'],
                 'content_type': response['ContentType'],
@@ -216,6 +349,9 @@ class StorageService:
             }
         except ClientError:
             return None
+        
+        self._cache_file_info(storage_key, info)
+        return dict(info)
     
     def validate_file(self, file_obj: BinaryIO, filename: str, mime_type: str) -> Tuple[bool, str]:
         """Validate uploaded file"""
@@ -231,18 +367,17 @@ class StorageService:
             return False, "File is empty"
         
         # Check MIME type
-        allowed_types = settings.allowed_mime_types_list
-        if mime_type not in allowed_types:
-            return False, f"MIME type {mime_type} not allowed. Allowed: {allowed_types}"
+        if mime_type not in settings.allowed_mime_types_set:
+            return False, f"MIME type {mime_type} not allowed. Allowed: {settings.allowed_mime_types_list}"
         
         # Validate actual file type using magic bytes
         try:
-            # Read first 1024 bytes for magic detection
+            # Read first 2048 bytes for magic detection
             file_obj.seek(0)
-            magic_bytes = file_obj.read(1024)
+            magic_bytes = file_obj.read(2048)
             file_obj.seek(0)
             
-            detected_mime = magic.from_buffer(magic_bytes, mime=True)
+            detected_mime = _magic.from_buffer(magic_bytes)
             if detected_mime != mime_type:
                 return False, f"File content doesn't match declared MIME type. Expected: {mime_type}, Detected: {detected_mime}"
                 
@@ -253,15 +388,13 @@ class StorageService:
     
     def calculate_file_hash(self, file_obj: BinaryIO) -> str:
         """Calculate SHA256 hash of file"""
-        sha256_hash = hashlib.sha256()
         file_obj.seek(0)
         
-        # Read file in chunks to handle large files
-        for chunk in iter(lambda: file_obj.read(4096), b""):
-            sha256_hash.update(chunk)
+        # Hashed in C; BytesIO buffers are digested without copying
+        digest = hashlib.file_digest(file_obj, "sha256").hexdigest()
         
         file_obj.seek(0)  # Reset to beginning
-        return sha256_hash.hexdigest()
+        return digest
     
     def get_image_dimensions(self, file_obj: BinaryIO) -> Tuple[Optional[int], Optional[int]]:
         """Get image dimensions"""
@@ -283,26 +416,33 @@ class StorageService:
         try:
             file_obj.seek(0)
             with Image.open(file_obj) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize to small size for faster processing
-                img = img.resize((150, 150))
-                
-                # Get color histogram
-                colors = img.getcolors(maxcolors=256*256*256)
-                if colors:
-                    # Get the most frequent color
-                    most_frequent = max(colors, key=lambda x: x[0])
-                    r, g, b = most_frequent[1]
-                    return f"#{r:02x}{g:02x}{b:02x}"
-                
-                file_obj.seek(0)  # Reset to beginning
-                return None
+                return _dominant_color(img)
         except Exception:
-            file_obj.seek(0)  # Reset to beginning
             return None
+        finally:
+            file_obj.seek(0)  # Reset to beginning
+    
+    def process_upload(self, file_obj: BinaryIO) -> UploadInfo:
+        """Read an upload once and derive size, MIME type, hash and image metadata from the same bytes"""
+        file_obj.seek(0)
+        buf = file_obj.read()
+        file_obj.seek(0)
+        
+        info = UploadInfo(
+            size=len(buf),
+            detected_mime=_magic.from_buffer(buf[:2048]),
+            hash_sha256=hashlib.sha256(buf).hexdigest()
+        )
+        
+        try:
+            with Image.open(io.BytesIO(buf)) as img:
+                info.width, info.height = img.size
+                if settings.MEDIA_DOMINANT_COLOR:
+                    info.dominant_color = _dominant_color(img)
+        except Exception:
+            pass  # Not an image, or undecodable; leave image metadata empty
+        
+        return info
 
 
 # Global storage service instance
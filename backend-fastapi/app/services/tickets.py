@@ -1,6 +1,7 @@
 """Ticket Service - Placeholder"""
 from typing import Dict, Any, Optional
 from app.models.tickets import TicketRedeemRequest
+from app.services.reports import invalidate_report_cache
 from app.utils.logging import LoggerMixin
 
 class TicketService(LoggerMixin):
@@ -9,6 +10,8 @@ class TicketService(LoggerMixin):
     
     async def redeem_ticket(self, request: TicketRedeemRequest, device) -> Dict[str, Any]:
         self.logger.info("Redeeming ticket", device_id=device["device_id"])
+        # Redemptions change the redeemed counts in the store's tickets report
+        await invalidate_report_cache(device["store_id"], ["tickets"])
         return {"result": "pass", "reason": "valid", "remaining": 4}
     
     async def get_ticket_by_id(self, ticket_id: str, user) -> Optional[Dict[str, Any]]:
@@ -1,14 +1,21 @@
 """
 Error Handling Utilities
 """
-from typing import Optional, Dict, Any
+from enum import StrEnum
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 
-class ErrorCode:
-    """Error code constants"""
+class ErrorCode(StrEnum):
+    """Error code constants
+
+    Members are ``str`` instances, so they compare equal to and serialize as
+    their plain code strings. Codes that share a value (e.g. ``EXPIRED`` and
+    ``E_EXPIRED``) are enum aliases of the same member.
+    """
     
     # Authentication errors
     MISSING_TOKEN = "E_MISSING_TOKEN"
@@ -125,6 +132,27 @@ class PlayParkException(Exception):
         super().__init__(self.message)
 
 
+@lru_cache(maxsize=1024)
+def _build_error_data(
+    error_code: str,
+    message: str,
+    details: Optional[Tuple[Tuple[str, Any], ...]] = None
+) -> Dict[str, Any]:
+    """Build the shared error body for a code/message/details combination.
+
+    The returned dict is cached and must not be mutated by callers.
+    """
+    error_data = {
+        "error": error_code,
+        "message": message
+    }
+    
+    if details:
+        error_data["details"] = dict(details)
+    
+    return error_data
+
+
 def create_error_response(
     error_code: str,
     message: str,
@@ -134,18 +162,17 @@ def create_error_response(
 ) -> JSONResponse:
     """Create standardized error response"""
     
-    error_data = {
-        "error": error_code,
-        "message": message
-    }
-    
-    if details:
-        error_data["details"] = details
+    details_key = tuple(details.items()) if details else None
+    try:
+        error_data = _build_error_data(error_code, message, details_key)
+    except TypeError:
+        # Unhashable detail values (lists, nested dicts) skip the cache
+        error_data = _build_error_data.__wrapped__(error_code, message, details_key)
     
     if request_id:
-        error_data["request_id"] = request_id
+        error_data = {**error_data, "request_id": request_id}
     
-    return JSONResponse(
+    return ORJSONResponse(
         content=error_data,
         status_code=status_code
     )
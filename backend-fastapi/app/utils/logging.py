@@ -1,78 +1,163 @@
 """
 Logging Configuration
 """
+import atexit
 import logging
+import queue
 import sys
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+import orjson
 import structlog
 from app.config import settings
 
 
+# Log lines are handed to a background QueueListener so request handlers
+# only pay for an enqueue; both structlog events and third-party stdlib
+# records share this queue and its single writer thread
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+# Numeric LOG_LEVEL, resolved once for setup_logging and the level gates
+_LOG_LEVEL_NO: int = getattr(logging, str(settings.LOG_LEVEL).upper(), logging.INFO)
+
+# Whether INFO events pass the configured level; lets the log_* helpers
+# skip building payloads that the filtering bound logger would drop
+_INFO_ENABLED = _LOG_LEVEL_NO <= logging.INFO
+
+
+class _StdoutHandler(logging.Handler):
+    """Write queued log lines to stdout, flushing once the queue drains"""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Every line goes through the binary buffer so structlog bytes and
+            # stdlib str records cannot be reordered between two buffers
+            msg = record.msg
+            if not isinstance(msg, bytes):
+                msg = str(msg).encode("utf-8", "backslashreplace")
+            stream = sys.stdout.buffer
+            stream.write(msg + b"\n")
+            if _log_queue.empty():
+                stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class _QueueLogger:
+    """structlog output logger that enqueues rendered events"""
+    
+    def __init__(self, name: str = ""):
+        self.name = name
+    
+    def msg(self, message: Any) -> None:
+        # Level filtering already happened in the filtering bound logger
+        _log_queue.put_nowait(
+            logging.makeLogRecord({"name": self.name, "msg": message, "levelno": logging.NOTSET})
+        )
+    
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+def _logger_factory(*args: Any) -> _QueueLogger:
+    """Create a queued logger named after the first get_logger() argument"""
+    return _QueueLogger(args[0] if args else "")
+
+
+def _orjson_renderer(logger, method_name, event_dict) -> bytes:
+    """Render the event as JSON bytes with orjson"""
+    return orjson.dumps(event_dict, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Levels applied to third-party stdlib loggers
+_THIRD_PARTY_LOG_LEVELS = (
+    ("uvicorn", logging.INFO),
+    ("uvicorn.access", logging.INFO),
+    ("motor", logging.WARNING),
+    ("pymongo", logging.WARNING),
+    ("redis", logging.WARNING),
+)
+
+
 def setup_logging() -> None:
     """Setup structured logging configuration"""
     
-    # Configure structlog
+    json_format = settings.LOG_FORMAT == "json"
+    
+    # Configure structlog; the filtering bound logger drops events below
+    # LOG_LEVEL without touching the stdlib logging machinery
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
+            _add_logger_name,
+            structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
+            _render_exc_and_stack_info,
             structlog.processors.UnicodeDecoder(),
-            _add_request_id,
-            _format_log_record,
+            _orjson_renderer if json_format else _format_log_record,
         ],
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        logger_factory=_logger_factory,
+        wrapper_class=structlog.make_filtering_bound_logger(_LOG_LEVEL_NO),
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging
+    # Standard library logging is only used by third-party libraries
+    queue_handler = QueueHandler(_log_queue)
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        level=_LOG_LEVEL_NO,
+        handlers=[queue_handler],
+        force=True,
     )
     
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_log_queue, _StdoutHandler(), respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    
     # Set log levels for third-party libraries
-    logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.INFO)
-    logging.getLogger("motor").setLevel(logging.WARNING)
-    logging.getLogger("pymongo").setLevel(logging.WARNING)
-    logging.getLogger("redis").setLevel(logging.WARNING)
+    for name, level in _THIRD_PARTY_LOG_LEVELS:
+        logging.getLogger(name).setLevel(level)
 
 
-def _add_request_id(logger, method_name, event_dict):
-    """Add request ID to log context"""
-    # This will be populated by middleware
+def _add_logger_name(logger, method_name, event_dict):
+    """Add the logger name to the event"""
+    event_dict["logger"] = getattr(logger, "name", "")
     return event_dict
 
 
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _render_exc_and_stack_info(logger, method_name, event_dict):
+    """Render exc_info/stack_info, skipping both renderers for plain events"""
+    if "exc_info" in event_dict or "stack_info" in event_dict:
+        event_dict = _stack_info_renderer(logger, method_name, event_dict)
+        event_dict = structlog.processors.format_exc_info(logger, method_name, event_dict)
+    return event_dict
+
+
+# Fields rendered positionally in console output
+_RESERVED_KEYS = frozenset(("timestamp", "level", "logger", "event"))
+
+
 def _format_log_record(logger, method_name, event_dict):
-    """Format log record based on environment"""
+    """Format log record for console output"""
     
-    if settings.LOG_FORMAT == "json":
-        return structlog.processors.JSONRenderer()(logger, method_name, event_dict)
-    else:
-        # Console format
-        timestamp = event_dict.get("timestamp", "")
-        level = event_dict.get("level", "").upper()
-        logger_name = event_dict.get("logger", "")
-        message = event_dict.get("event", "")
-        
-        # Build log line
-        log_parts = [timestamp, level, logger_name, message]
-        
-        # Add additional fields
-        for key, value in event_dict.items():
-            if key not in ["timestamp", "level", "logger", "event"]:
-                log_parts.append(f"{key}={value}")
-        
-        return " ".join(str(part) for part in log_parts if part)
+    timestamp = event_dict.get("timestamp", "")
+    level = event_dict.get("level", "").upper()
+    logger_name = event_dict.get("logger", "")
+    message = event_dict.get("event", "")
+    
+    # Build log line; only the event itself may be a non-string
+    log_parts = [part for part in (timestamp, level, logger_name, str(message)) if part]
+    
+    # Add additional fields
+    log_parts.extend(f"{key}={value}" for key, value in event_dict.items() if key not in _RESERVED_KEYS)
+    
+    return " ".join(log_parts)
 
 
 def get_logger(name: str) -> structlog.BoundLogger:
@@ -89,6 +174,15 @@ class LoggerMixin:
         return get_logger(self.__class__.__name__)
 
 
+# Module-level loggers for the log_* helpers; structlog resolves and caches
+# each one on first use (cache_logger_on_first_use=True)
+_HTTP_LOGGER = get_logger("http.request")
+_ERROR_LOGGER = get_logger("app.error")
+_SECURITY_LOGGER = get_logger("security.event")
+_BUSINESS_LOGGER = get_logger("business.event")
+_PERF_LOGGER = get_logger("performance")
+
+
 def log_request(
     method: str,
     path: str,
@@ -100,7 +194,8 @@ def log_request(
 ) -> None:
     """Log HTTP request"""
     
-    logger = get_logger("http.request")
+    if status_code < 400 and not _INFO_ENABLED:
+        return
     
     log_data = {
         "method": method,
@@ -118,9 +213,9 @@ def log_request(
     log_data.update(kwargs)
     
     if status_code >= 400:
-        logger.warning("HTTP request completed with error", **log_data)
+        _HTTP_LOGGER.warning("HTTP request completed with error", **log_data)
     else:
-        logger.info("HTTP request completed", **log_data)
+        _HTTP_LOGGER.info("HTTP request completed", **log_data)
 
 
 def log_error(
@@ -131,8 +226,6 @@ def log_error(
 ) -> None:
     """Log application error"""
     
-    logger = get_logger("app.error")
-    
     log_data = {
         "error_type": type(error).__name__,
         "error_message": str(error),
@@ -147,7 +240,7 @@ def log_error(
     if request_id:
         log_data["request_id"] = request_id
     
-    logger.error("Application error occurred", **log_data, exc_info=error)
+    _ERROR_LOGGER.error("Application error occurred", **log_data, exc_info=error)
 
 
 def log_security_event(
@@ -159,8 +252,6 @@ def log_security_event(
 ) -> None:
     """Log security-related event"""
     
-    logger = get_logger("security.event")
-    
     log_data = {
         "event_type": event_type,
     }
@@ -177,7 +268,7 @@ def log_security_event(
     if details:
         log_data.update(details)
     
-    logger.warning("Security event", **log_data)
+    _SECURITY_LOGGER.warning("Security event", **log_data)
 
 
 def log_business_event(
@@ -189,7 +280,8 @@ def log_business_event(
 ) -> None:
     """Log business-related event"""
     
-    logger = get_logger("business.event")
+    if not _INFO_ENABLED:
+        return
     
     log_data = {
         "event_type": event_type,
@@ -207,7 +299,7 @@ def log_business_event(
     if details:
         log_data.update(details)
     
-    logger.info("Business event", **log_data)
+    _BUSINESS_LOGGER.info("Business event", **log_data)
 
 
 def log_performance(
@@ -218,7 +310,8 @@ def log_performance(
 ) -> None:
     """Log performance metrics"""
     
-    logger = get_logger("performance")
+    if not _INFO_ENABLED:
+        return
     
     log_data = {
         "operation": operation,
@@ -229,4 +322,4 @@ def log_performance(
     if details:
         log_data.update(details)
     
-    logger.info("Performance metric", **log_data)
+    _PERF_LOGGER.info("Performance metric", **log_data)
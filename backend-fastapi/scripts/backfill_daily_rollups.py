@@ -0,0 +1,51 @@
+"""
+Roll up closed days of sales into sales_daily_rollups; run once to backfill
+and then daily (e.g. from cron) to add each newly closed day
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.mongo import get_database
+from app.repositories.sales import SalesRepository
+
+
+async def backfill_daily_rollups():
+    """Roll up every closed day after each store's latest rollup from raw sales"""
+    print("Starting daily rollup backfill...")
+
+    try:
+        db = await get_database()
+        sales_repo = SalesRepository(db)
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        for store_id in await db.sales.distinct("store_id"):
+            latest_rollup = await db.sales_daily_rollups.find_one(
+                {"store_id": store_id, "rebuilt": True}, projection={"date": 1}, sort=[("date", -1)]
+            )
+            if latest_rollup:
+                from_date = datetime.strptime(latest_rollup["date"], "%Y-%m-%d") + timedelta(days=1)
+            else:
+                first_sale = await db.sales.find_one(
+                    {"store_id": store_id}, projection={"timestamp": 1}, sort=[("timestamp", 1)]
+                )
+                from_date = first_sale["timestamp"].replace(hour=0, minute=0, second=0, microsecond=0)
+            if from_date >= today_start:
+                continue
+
+            await sales_repo.rebuild_daily_rollups(store_id, from_date, today_start)
+            print(f"Rebuilt {(today_start - from_date).days} days for store {store_id}")
+
+        print("Daily rollup backfill completed successfully!")
+
+    except Exception as e:
+        print(f"Error backfilling daily rollups: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_daily_rollups())
@@ -6,6 +6,7 @@ import os
 import sys
 from datetime import datetime
 from ulid import ULID
+from pymongo import UpdateOne
 
 # Add the app directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -27,23 +28,15 @@ async def seed_initial_data():
         # Get database
         db = await get_database()
         
-        # Seed taxes
-        await seed_taxes(db)
-        
-        # Seed payment types
-        await seed_payment_types(db)
-        
-        # Seed discounts
-        await seed_discounts(db)
-        
-        # Seed settings
-        await seed_settings(db)
-        
-        # Seed reason codes
-        await seed_reason_codes(db)
-        
-        # Seed feature flags
-        await seed_feature_flags(db)
+        # Each seeder touches its own collection, so they run concurrently
+        await asyncio.gather(
+            seed_taxes(db),
+            seed_payment_types(db),
+            seed_discounts(db),
+            seed_settings(db),
+            seed_reason_codes(db),
+            seed_feature_flags(db),
+        )
         
         print("Database seeding completed successfully!")
         
@@ -58,12 +51,6 @@ async def seed_taxes(db):
     
     taxes_collection = db.taxes
     
-    # Check if taxes already exist
-    existing_tax = await taxes_collection.find_one({"tenant_id": "default"})
-    if existing_tax:
-        print("Taxes already exist, skipping...")
-        return
-    
     # Default VAT tax
     default_tax = Tax(
         tenant_id="default",
@@ -74,8 +61,12 @@ async def seed_taxes(db):
         description="Standard VAT rate for Thailand"
     )
     
-    await taxes_collection.insert_one(default_tax.dict(by_alias=True, exclude={"id"}))
-    print("✓ Default tax created")
+    result = await taxes_collection.update_one(
+        {"tenant_id": default_tax.tenant_id, "name": default_tax.name},
+        {"$setOnInsert": default_tax.model_dump(by_alias=True, exclude={"id"})},
+        upsert=True
+    )
+    print(f"✓ {int(result.upserted_id is not None)} default tax created")
 
 
 async def seed_payment_types(db):
@@ -84,12 +75,6 @@ async def seed_payment_types(db):
     
     payment_types_collection = db.payment_types
     
-    # Check if payment types already exist
-    existing_payment_type = await payment_types_collection.find_one({"tenant_id": "default"})
-    if existing_payment_type:
-        print("Payment types already exist, skipping...")
-        return
-    
     payment_types = [
         PaymentType(
             tenant_id="default",
@@ -120,10 +105,18 @@ async def seed_payment_types(db):
         )
     ]
     
-    for payment_type in payment_types:
-        await payment_types_collection.insert_one(payment_type.dict(by_alias=True, exclude={"id"}))
-    
-    print("✓ Default payment types created")
+    result = await payment_types_collection.bulk_write(
+        [
+            UpdateOne(
+                {"tenant_id": payment_type.tenant_id, "code": payment_type.code},
+                {"$setOnInsert": payment_type.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for payment_type in payment_types
+        ],
+        ordered=False
+    )
+    print(f"✓ {result.upserted_count} default payment types created")
 
 
 async def seed_discounts(db):
@@ -132,12 +125,6 @@ async def seed_discounts(db):
     
     discounts_collection = db.discounts
     
-    # Check if discounts already exist
-    existing_discount = await discounts_collection.find_one({"tenant_id": "default"})
-    if existing_discount:
-        print("Discounts already exist, skipping...")
-        return
-    
     # Sample discount
     sample_discount = Discount(
         tenant_id="default",
@@ -154,8 +141,12 @@ async def seed_discounts(db):
         conditions={"time_start": "06:00", "time_end": "10:00"}
     )
     
-    await discounts_collection.insert_one(sample_discount.dict(by_alias=True, exclude={"id"}))
-    print("✓ Default discount created")
+    result = await discounts_collection.update_one(
+        {"tenant_id": sample_discount.tenant_id, "code": sample_discount.code},
+        {"$setOnInsert": sample_discount.model_dump(by_alias=True, exclude={"id"})},
+        upsert=True
+    )
+    print(f"✓ {int(result.upserted_id is not None)} default discount created")
 
 
 async def seed_settings(db):
@@ -164,12 +155,6 @@ async def seed_settings(db):
     
     settings_collection = db.settings
     
-    # Check if settings already exist
-    existing_setting = await settings_collection.find_one({"tenant_id": "default"})
-    if existing_setting:
-        print("Settings already exist, skipping...")
-        return
-    
     default_settings = [
         Setting(
             tenant_id="default",
@@ -218,10 +203,18 @@ async def seed_settings(db):
         )
     ]
     
-    for setting in default_settings:
-        await settings_collection.insert_one(setting.dict(by_alias=True, exclude={"id"}))
-    
-    print("✓ Default settings created")
+    result = await settings_collection.bulk_write(
+        [
+            UpdateOne(
+                {"tenant_id": setting.tenant_id, "key": setting.key},
+                {"$setOnInsert": setting.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for setting in default_settings
+        ],
+        ordered=False
+    )
+    print(f"✓ {result.upserted_count} default settings created")
 
 
 async def seed_reason_codes(db):
@@ -230,12 +223,6 @@ async def seed_reason_codes(db):
     
     reason_codes_collection = db.reason_codes
     
-    # Check if reason codes already exist
-    existing_reason_code = await reason_codes_collection.find_one({"tenant_id": "default"})
-    if existing_reason_code:
-        print("Reason codes already exist, skipping...")
-        return
-    
     reason_codes = [
         ReasonCode(
             tenant_id="default",
@@ -284,10 +271,18 @@ async def seed_reason_codes(db):
         )
     ]
     
-    for reason_code in reason_codes:
-        await reason_codes_collection.insert_one(reason_code.dict(by_alias=True, exclude={"id"}))
-    
-    print("✓ Default reason codes created")
+    result = await reason_codes_collection.bulk_write(
+        [
+            UpdateOne(
+                {"tenant_id": reason_code.tenant_id, "code": reason_code.code},
+                {"$setOnInsert": reason_code.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for reason_code in reason_codes
+        ],
+        ordered=False
+    )
+    print(f"✓ {result.upserted_count} default reason codes created")
 
 
 async def seed_feature_flags(db):
@@ -296,12 +291,6 @@ async def seed_feature_flags(db):
     
     feature_flags_collection = db.feature_flags
     
-    # Check if feature flags already exist
-    existing_feature_flag = await feature_flags_collection.find_one({"key": "new_checkout_flow"})
-    if existing_feature_flag:
-        print("Feature flags already exist, skipping...")
-        return
-    
     feature_flags = [
         FeatureFlag(
             key="new_checkout_flow",
@@ -337,10 +326,18 @@ async def seed_feature_flags(db):
         )
     ]
     
-    for feature_flag in feature_flags:
-        await feature_flags_collection.insert_one(feature_flag.dict(by_alias=True, exclude={"id"}))
-    
-    print("✓ Default feature flags created")
+    result = await feature_flags_collection.bulk_write(
+        [
+            UpdateOne(
+                {"key": feature_flag.key},
+                {"$setOnInsert": feature_flag.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for feature_flag in feature_flags
+        ],
+        ordered=False
+    )
+    print(f"✓ {result.upserted_count} default feature flags created")
 
 
 if __name__ == "__main__":
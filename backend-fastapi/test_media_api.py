@@ -5,7 +5,7 @@ Test script for Media API functionality
 import asyncio
 import httpx
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class MediaAPITester:
@@ -20,52 +20,64 @@ class MediaAPITester:
         }
         if token:
             self.headers["Authorization"] = f"Bearer {token}"
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self) -> "MediaAPITester":
+        # One pooled client shared by every test call; keep-alive
+        # connections are reused by the concurrent read checks
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=10.0
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
     
     async def test_presign_upload(self, filename: str, mime_type: str, owner_type: str, owner_id: str) -> Dict[str, Any]:
         """Test presigned upload URL generation"""
         print(f"Testing presign upload for {filename}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/media/uploads/presign",
-                headers=self.headers,
-                json={
-                    "filename": filename,
-                    "mime_type": mime_type,
-                    "owner_type": owner_type,
-                    "owner_id": owner_id
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Presign successful: {data['asset_id']}")
-                return data
-            else:
-                print(f"✗ Presign failed: {response.status_code} - {response.text}")
-                return {}
+        response = await self._client.post(
+            "/api/v1/media/uploads/presign",
+            json={
+                "filename": filename,
+                "mime_type": mime_type,
+                "owner_type": owner_type,
+                "owner_id": owner_id
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✓ Presign successful: {data['asset_id']}")
+            return data
+        else:
+            print(f"✗ Presign failed: {response.status_code} - {response.text}")
+            return {}
     
     async def test_complete_upload(self, asset_id: str, storage_key: str) -> Dict[str, Any]:
         """Test upload completion"""
         print(f"Testing upload completion for {asset_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/media/complete",
-                headers=self.headers,
-                json={
-                    "asset_id": asset_id,
-                    "storage_key": storage_key
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Upload completion successful: {data['processing_status']}")
-                return data
-            else:
-                print(f"✗ Upload completion failed: {response.status_code} - {response.text}")
-                return {}
+        response = await self._client.post(
+            "/api/v1/media/complete",
+            json={
+                "asset_id": asset_id,
+                "storage_key": storage_key
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✓ Upload completion successful: {data['processing_status']}")
+            return data
+        else:
+            print(f"✗ Upload completion failed: {response.status_code} - {response.text}")
+            return {}
     
     async def test_list_assets(self, owner_type: str = None, owner_id: str = None) -> list:
         """Test asset listing"""
@@ -77,109 +89,97 @@ class MediaAPITester:
         if owner_id:
             params["owner_id"] = owner_id
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/v1/media",
-                headers=self.headers,
-                params=params
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ List assets successful: {len(data)} assets found")
-                return data
-            else:
-                print(f"✗ List assets failed: {response.status_code} - {response.text}")
-                return []
+        response = await self._client.get(
+            "/api/v1/media",
+            params=params
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✓ List assets successful: {len(data)} assets found")
+            return data
+        else:
+            print(f"✗ List assets failed: {response.status_code} - {response.text}")
+            return []
     
     async def test_get_asset(self, asset_id: str) -> Dict[str, Any]:
         """Test getting specific asset"""
         print(f"Testing get asset {asset_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/v1/media/{asset_id}",
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Get asset successful: {data['filename_original']}")
-                return data
-            else:
-                print(f"✗ Get asset failed: {response.status_code} - {response.text}")
-                return {}
+        response = await self._client.get(
+            f"/api/v1/media/{asset_id}"
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✓ Get asset successful: {data['filename_original']}")
+            return data
+        else:
+            print(f"✗ Get asset failed: {response.status_code} - {response.text}")
+            return {}
     
     async def test_product_images(self, product_id: str) -> list:
         """Test product images endpoint"""
         print(f"Testing product images for {product_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/v1/media/products/{product_id}/images",
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Product images successful: {len(data)} images found")
-                return data
-            else:
-                print(f"✗ Product images failed: {response.status_code} - {response.text}")
-                return []
+        response = await self._client.get(
+            f"/api/v1/media/products/{product_id}/images"
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✓ Product images successful: {len(data)} images found")
+            return data
+        else:
+            print(f"✗ Product images failed: {response.status_code} - {response.text}")
+            return []
     
     async def test_reorder_images(self, product_id: str, asset_ids: list) -> bool:
         """Test reordering product images"""
         print(f"Testing reorder images for {product_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/media/products/{product_id}/images/order",
-                headers=self.headers,
-                json={"asset_ids": asset_ids}
-            )
-            
-            if response.status_code == 200:
-                print("✓ Reorder images successful")
-                return True
-            else:
-                print(f"✗ Reorder images failed: {response.status_code} - {response.text}")
-                return False
+        response = await self._client.post(
+            f"/api/v1/media/products/{product_id}/images/order",
+            json={"asset_ids": asset_ids}
+        )
+        
+        if response.status_code == 200:
+            print("✓ Reorder images successful")
+            return True
+        else:
+            print(f"✗ Reorder images failed: {response.status_code} - {response.text}")
+            return False
     
     async def test_set_primary_image(self, product_id: str, asset_id: str) -> bool:
         """Test setting primary image"""
         print(f"Testing set primary image for {product_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/media/products/{product_id}/images/primary",
-                headers=self.headers,
-                json={"asset_id": asset_id}
-            )
-            
-            if response.status_code == 200:
-                print("✓ Set primary image successful")
-                return True
-            else:
-                print(f"✗ Set primary image failed: {response.status_code} - {response.text}")
-                return False
+        response = await self._client.post(
+            f"/api/v1/media/products/{product_id}/images/primary",
+            json={"asset_id": asset_id}
+        )
+        
+        if response.status_code == 200:
+            print("✓ Set primary image successful")
+            return True
+        else:
+            print(f"✗ Set primary image failed: {response.status_code} - {response.text}")
+            return False
     
     async def test_delete_asset(self, asset_id: str) -> bool:
         """Test deleting an asset"""
         print(f"Testing delete asset {asset_id}...")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{self.base_url}/api/v1/media/{asset_id}",
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                print("✓ Delete asset successful")
-                return True
-            else:
-                print(f"✗ Delete asset failed: {response.status_code} - {response.text}")
-                return False
+        response = await self._client.delete(
+            f"/api/v1/media/{asset_id}"
+        )
+        
+        if response.status_code == 200:
+            print("✓ Delete asset successful")
+            return True
+        else:
+            print(f"✗ Delete asset failed: {response.status_code} - {response.text}")
+            return False
     
     async def run_full_test(self):
         """Run a complete test suite"""
@@ -205,17 +205,15 @@ class MediaAPITester:
         print("\n⚠️  Note: Complete upload test requires actual file upload to S3")
         complete_data = await self.test_complete_upload(asset_id, storage_key)
         
-        # Test 3: List assets
-        await self.test_list_assets()
-        
-        # Test 4: List assets with filters
-        await self.test_list_assets(owner_type="product", owner_id="test_product_123")
-        
-        # Test 5: Get specific asset (will fail if upload wasn't completed)
-        await self.test_get_asset(asset_id)
-        
-        # Test 6: Product images
-        await self.test_product_images("test_product_123")
+        # Tests 3-6 are independent reads, so run them concurrently:
+        # list assets, list with filters, get specific asset (will fail if
+        # upload wasn't completed) and product images
+        await asyncio.gather(
+            self.test_list_assets(),
+            self.test_list_assets(owner_type="product", owner_id="test_product_123"),
+            self.test_get_asset(asset_id),
+            self.test_product_images("test_product_123"),
+        )
         
         # Test 7: Reorder images (will fail without actual images)
         await self.test_reorder_images("test_product_123", [asset_id])
@@ -236,8 +234,8 @@ async def main():
     # token = "your_jwt_token_here"
     token = None
     
-    tester = MediaAPITester(token=token)
-    await tester.run_full_test()
+    async with MediaAPITester(token=token) as tester:
+        await tester.run_full_test()
 
 
 if __name__ == "__main__":
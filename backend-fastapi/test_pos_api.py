@@ -5,10 +5,15 @@ Tests the core functionality of the POS Tickets API system
 """
 
 import asyncio
+import httpx
 import pytest
 from datetime import datetime, timedelta
-from typing import Dict, Any
-import json
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
+import sys
+import time
+
+import orjson
 
 # Test configuration
 BASE_URL = "http://localhost:48080"
@@ -23,19 +28,64 @@ TEST_DEVICE_ID = "test_device_abc"
 # JWT token for testing (you'll need to generate a real one)
 TEST_JWT_TOKEN = "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.eyJzdWIiOiJ0ZXN0X2VtcGxveWVlXzc4OSIsInR5cGUiOiJhY2Nlc3MiLCJ0ZW5hbnRfaWQiOiJ0ZXN0X3RlbmFudF8xMjMiLCJzdG9yZV9pZCI6InRlc3Rfc3RvcmVfNDU2Iiwic2NvcGVzIjpbInNhbGVzIiwidGlja2V0cyIsInJlcG9ydHMiXSwicm9sZXMiOlsiY2FzaGllciIsIm1hbmFnZXIiXSwicGVybWlzc2lvbnMiOlsi cmVhZCIsIndyaXRlIl0sImV4cCI6OTk5OTk5OTk5OX0.dummy_signature"
 
+# Auth headers shared by every scenario; read-only since the token is fixed
+_AUTH_HEADERS = MappingProxyType({
+    "Authorization": f"Bearer {TEST_JWT_TOKEN}",
+    "Content-Type": "application/json"
+})
+
+# [epoch second, formatted timestamp] reused until the second rolls over
+_ISO_NOW_CACHE = [0, ""]
+
+
+def _iso_now() -> str:
+    """UTC ISO timestamp, formatted at most once per second"""
+    now = int(time.time())
+    if now != _ISO_NOW_CACHE[0]:
+        _ISO_NOW_CACHE[0] = now
+        _ISO_NOW_CACHE[1] = datetime.utcfromtimestamp(now).isoformat()
+    return _ISO_NOW_CACHE[1]
+
 class POSAPITester:
     """Test suite for POS API functionality"""
     
+    headers = _AUTH_HEADERS
+    
+    # Scenario methods run by run_all_tests, in reporting order
+    _TEST_METHODS = (
+        "test_pricing_preview",
+        "test_ticket_redemption",
+        "test_open_ticket_flow",
+        "test_cash_drawer_operations",
+        "test_timecard_validation",
+        "test_customer_management",
+        "test_settings_hierarchy",
+        "test_approval_system",
+        "test_provider_health",
+        "test_usage_counters",
+    )
+    
     def __init__(self):
+        self.session: Optional[httpx.AsyncClient] = None
+        # Status lines, written to stdout in one call by run_all_tests
+        self._log: List[str] = []
+    
+    async def __aenter__(self) -> "POSAPITester":
+        # One pooled client shared by every scenario
+        self.session = httpx.AsyncClient(
+            base_url=API_BASE,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.aclose()
         self.session = None
-        self.headers = {
-            "Authorization": f"Bearer {TEST_JWT_TOKEN}",
-            "Content-Type": "application/json"
-        }
     
     async def test_pricing_preview(self):
         """Test pricing preview functionality"""
-        print("Testing pricing preview...")
+        self._log.append("Testing pricing preview...")
         
         # Test data for pricing preview
         preview_data = {
@@ -51,15 +101,14 @@ class POSAPITester:
         }
         
         # This would make an actual HTTP request in a real test
-        # response = await self.session.post(f"{API_BASE}/pricing/preview", 
-        #                                   json=preview_data, headers=self.headers)
+        # response = await self.session.post("/pricing/preview", json=preview_data)
         
-        print("✅ Pricing preview test structure created")
+        self._log.append("✅ Pricing preview test structure created")
         return True
     
     async def test_ticket_redemption(self):
         """Test ticket redemption flow"""
-        print("Testing ticket redemption...")
+        self._log.append("Testing ticket redemption...")
         
         redemption_data = {
             "ticket_id": "ticket_789",
@@ -69,12 +118,12 @@ class POSAPITester:
             "reason": "successful_redemption"
         }
         
-        print("✅ Ticket redemption test structure created")
+        self._log.append("✅ Ticket redemption test structure created")
         return True
     
     async def test_open_ticket_flow(self):
         """Test open ticket park/checkout flow"""
-        print("Testing open ticket flow...")
+        self._log.append("Testing open ticket flow...")
         
         # Create open ticket
         open_ticket_data = {
@@ -94,12 +143,12 @@ class POSAPITester:
             "amount_paid": 5000
         }
         
-        print("✅ Open ticket flow test structure created")
+        self._log.append("✅ Open ticket flow test structure created")
         return True
     
     async def test_cash_drawer_operations(self):
         """Test cash drawer operations"""
-        print("Testing cash drawer operations...")
+        self._log.append("Testing cash drawer operations...")
         
         # Open drawer
         open_data = {
@@ -113,12 +162,12 @@ class POSAPITester:
             "employee_id": TEST_EMPLOYEE_ID
         }
         
-        print("✅ Cash drawer operations test structure created")
+        self._log.append("✅ Cash drawer operations test structure created")
         return True
     
     async def test_timecard_validation(self):
         """Test timecard overlap prevention"""
-        print("Testing timecard validation...")
+        self._log.append("Testing timecard validation...")
         
         clock_in_data = {
             "employee_id": TEST_EMPLOYEE_ID,
@@ -126,12 +175,12 @@ class POSAPITester:
             "location": "main_register"
         }
         
-        print("✅ Timecard validation test structure created")
+        self._log.append("✅ Timecard validation test structure created")
         return True
     
     async def test_customer_management(self):
         """Test customer CRUD operations"""
-        print("Testing customer management...")
+        self._log.append("Testing customer management...")
         
         customer_data = {
             "name": "John Doe",
@@ -140,12 +189,12 @@ class POSAPITester:
             "loyalty_points": 0
         }
         
-        print("✅ Customer management test structure created")
+        self._log.append("✅ Customer management test structure created")
         return True
     
     async def test_settings_hierarchy(self):
         """Test settings tenant + store overrides"""
-        print("Testing settings hierarchy...")
+        self._log.append("Testing settings hierarchy...")
         
         # Tenant setting
         tenant_setting = {
@@ -161,12 +210,12 @@ class POSAPITester:
             "scope": "store"
         }
         
-        print("✅ Settings hierarchy test structure created")
+        self._log.append("✅ Settings hierarchy test structure created")
         return True
     
     async def test_approval_system(self):
         """Test PIN-based approvals"""
-        print("Testing approval system...")
+        self._log.append("Testing approval system...")
         
         approval_data = {
             "pin": "1234",
@@ -175,25 +224,25 @@ class POSAPITester:
             "reason_code": "customer_request"
         }
         
-        print("✅ Approval system test structure created")
+        self._log.append("✅ Approval system test structure created")
         return True
     
     async def test_provider_health(self):
         """Test provider health monitoring"""
-        print("Testing provider health monitoring...")
+        self._log.append("Testing provider health monitoring...")
         
         heartbeat_data = {
             "device_id": TEST_DEVICE_ID,
             "status": "online",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _iso_now()
         }
         
-        print("✅ Provider health monitoring test structure created")
+        self._log.append("✅ Provider health monitoring test structure created")
         return True
     
     async def test_usage_counters(self):
         """Test usage counter aggregation"""
-        print("Testing usage counters...")
+        self._log.append("Testing usage counters...")
         
         usage_data = {
             "endpoint": "/api/v1/payments",
@@ -201,113 +250,109 @@ class POSAPITester:
             "count": 1
         }
         
-        print("✅ Usage counters test structure created")
+        self._log.append("✅ Usage counters test structure created")
         return True
     
     async def run_all_tests(self):
         """Run all test scenarios"""
-        print("🚀 Starting POS API Test Suite")
-        print("=" * 50)
+        self._log.append("🚀 Starting POS API Test Suite")
+        self._log.append("=" * 50)
         
-        tests = [
-            self.test_pricing_preview,
-            self.test_ticket_redemption,
-            self.test_open_ticket_flow,
-            self.test_cash_drawer_operations,
-            self.test_timecard_validation,
-            self.test_customer_management,
-            self.test_settings_hierarchy,
-            self.test_approval_system,
-            self.test_provider_health,
-            self.test_usage_counters
-        ]
+        # Scenarios are independent, so run them concurrently
+        results = await asyncio.gather(
+            *(getattr(self, name)() for name in self._TEST_METHODS), return_exceptions=True
+        )
+        failures = [name for name, result in zip(self._TEST_METHODS, results) if result is not True]
+        for name, result in zip(self._TEST_METHODS, results):
+            if isinstance(result, Exception):
+                self._log.append(f"❌ {name} failed: {result}")
         
-        results = []
-        for test in tests:
-            try:
-                result = await test()
-                results.append(result)
-            except Exception as e:
-                print(f"❌ Test failed: {e}")
-                results.append(False)
+        total = len(self._TEST_METHODS)
+        passed = total - len(failures)
         
-        passed = sum(results)
-        total = len(results)
+        self._log.append("=" * 50)
+        self._log.append(f"📊 Test Results: {passed}/{total} tests passed")
         
-        print("=" * 50)
-        print(f"📊 Test Results: {passed}/{total} tests passed")
-        
-        if passed == total:
-            print("🎉 All tests passed! POS API is ready for production.")
+        if not failures:
+            self._log.append("🎉 All tests passed! POS API is ready for production.")
         else:
-            print("⚠️  Some tests failed. Please review the implementation.")
+            self._log.append(f"⚠️  Failed: {', '.join(failures)}. Please review the implementation.")
+        
+        sys.stdout.write("\n".join(self._log) + "\n")
+        self._log.clear()
         
-        return passed == total
+        return not failures
 
-def create_test_data():
-    """Create test data for the POS API"""
-    test_data = {
-        "tenant": {
-            "tenant_id": TEST_TENANT_ID,
-            "name": "Test Tenant",
-            "timezone": "Asia/Bangkok",
-            "currency": "THB"
-        },
-        "store": {
-            "store_id": TEST_STORE_ID,
-            "name": "Test Store",
-            "address": "123 Test Street, Bangkok"
-        },
-        "employee": {
-            "employee_id": TEST_EMPLOYEE_ID,
-            "name": "Test Employee",
-            "role": "cashier",
-            "pin": "1234"
-        },
-        "device": {
-            "device_id": TEST_DEVICE_ID,
-            "name": "Test POS Terminal",
-            "type": "pos_terminal"
-        },
-        "tax": {
-            "name": "VAT",
-            "rate": 700,  # 7% in basis points
-            "active": True
-        },
-        "payment_type": {
-            "name": "Cash",
-            "active": True
-        },
-        "discount": {
-            "name": "Early Bird",
-            "type": "percentage",
-            "value": 1000,  # 10% in basis points
-            "active": True
-        }
+# Test data for the POS API, built once at import
+_TEST_DATA = {
+    "tenant": {
+        "tenant_id": TEST_TENANT_ID,
+        "name": "Test Tenant",
+        "timezone": "Asia/Bangkok",
+        "currency": "THB"
+    },
+    "store": {
+        "store_id": TEST_STORE_ID,
+        "name": "Test Store",
+        "address": "123 Test Street, Bangkok"
+    },
+    "employee": {
+        "employee_id": TEST_EMPLOYEE_ID,
+        "name": "Test Employee",
+        "role": "cashier",
+        "pin": "1234"
+    },
+    "device": {
+        "device_id": TEST_DEVICE_ID,
+        "name": "Test POS Terminal",
+        "type": "pos_terminal"
+    },
+    "tax": {
+        "name": "VAT",
+        "rate": 700,  # 7% in basis points
+        "active": True
+    },
+    "payment_type": {
+        "name": "Cash",
+        "active": True
+    },
+    "discount": {
+        "name": "Early Bird",
+        "type": "percentage",
+        "value": 1000,  # 10% in basis points
+        "active": True
     }
-    
-    return test_data
+}
+
+# Serialized once for the reference printout in main()
+_TEST_DATA_JSON = orjson.dumps(_TEST_DATA, option=orjson.OPT_INDENT_2)
 
 async def main():
     """Main test runner"""
     print("PlayPark POS API Test Suite")
     print("=" * 50)
     
-    # Create test data
-    test_data = create_test_data()
     print("📝 Test data created")
     
     # Run tests
-    tester = POSAPITester()
-    success = await tester.run_all_tests()
+    async with POSAPITester() as tester:
+        success = await tester.run_all_tests()
     
     # Output test data for reference
     print("\n📋 Test Data Reference:")
-    print(json.dumps(test_data, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_TEST_DATA_JSON + b"\n")
     
     return success
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to asyncio when absent
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Run the test suite
     success = asyncio.run(main())
     exit(0 if success else 1)
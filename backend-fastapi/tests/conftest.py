@@ -0,0 +1,18 @@
+"""
+Shared Test Fixtures
+"""
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop so async clients can be shared"""
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -1,23 +1,32 @@
 """
 Main Application Tests
 """
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient, Timeout
 
 from app.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Test client fixture"""
+    """Test client fixture, shared by the whole session"""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session", autouse=True)
+def _warm_openapi():
+    """Build the OpenAPI schema once; FastAPI caches it on app.openapi_schema"""
+    app.openapi()
+
+
+@pytest.fixture(scope="session")
 async def async_client():
     """Async test client fixture"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", timeout=Timeout(5.0)) as ac:
         yield ac
 
 
@@ -88,19 +97,24 @@ async def test_employee_login(async_client):
     assert response.status_code in [200, 401, 500]
 
 
-def test_cors_headers(client):
+@pytest.mark.asyncio
+async def test_cors_headers(async_client):
     """Test CORS headers"""
-    response = client.options("/api/v1/auth/device/login")
+    response = await async_client.options(
+        "/api/v1/auth/device/login",
+        headers={"Origin": "http://example.com", "Access-Control-Request-Method": "POST"}
+    )
     
     # CORS headers should be present
     assert "access-control-allow-origin" in response.headers
 
 
-def test_rate_limiting_headers(client):
+@pytest.mark.asyncio
+async def test_rate_limiting_headers(async_client):
     """Test rate limiting headers"""
-    # Make multiple requests to trigger rate limiting
-    for _ in range(5):
-        response = client.get("/healthz")
+    # Make multiple concurrent requests to trigger rate limiting
+    responses = await asyncio.gather(*(async_client.get("/healthz") for _ in range(5)))
+    response = responses[-1]
     
     # Rate limit headers should be present
     assert response.status_code == 200
@@ -0,0 +1,20 @@
+"""
+POS API Scenario Tests
+"""
+import pytest
+
+from test_pos_api import POSAPITester
+
+
+@pytest.fixture(scope="module")
+async def pos_tester():
+    """POS API tester whose pooled client is shared by every scenario"""
+    async with POSAPITester() as tester:
+        yield tester
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", POSAPITester._TEST_METHODS)
+async def test_pos_scenario(pos_tester, scenario):
+    """Run each POS scenario as its own test case"""
+    assert await getattr(pos_tester, scenario)() is True
@@ -0,0 +1,64 @@
+"""
+Report Service Tests
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import reports
+from app.services.reports import ReportService
+
+
+@pytest.fixture
+def report_service(monkeypatch):
+    """Report service over mocked repositories and an empty cache"""
+    monkeypatch.setattr(reports, "redis_get", AsyncMock(return_value=None))
+    monkeypatch.setattr(reports, "redis_set", AsyncMock(return_value=True))
+    
+    sales_repo = AsyncMock()
+    sales_repo.get_daily_rollups.return_value = []
+    sales_repo.aggregate_sales_report.return_value = []
+    return ReportService(AsyncMock(), sales_repo, AsyncMock(), AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_sales_report_accepts_aware_dates(report_service):
+    """Test timezone-aware query dates are normalized to naive UTC"""
+    user = SimpleNamespace(employee_id="emp_1", store_id="store_1")
+    bangkok = timezone(timedelta(hours=7))
+    
+    report = await report_service.get_sales_report(
+        user,
+        from_date=datetime(2024, 1, 1, 7, tzinfo=bangkok),
+        to_date=datetime(2024, 1, 3, 7, tzinfo=bangkok)
+    )
+    
+    assert report["total_transactions"] == 0
+    assert report["date_range"] == {"from": "2024-01-01T00:00:00", "to": "2024-01-03T00:00:00"}
+
+
+@pytest.mark.asyncio
+async def test_sales_report_reads_consecutive_rollups_only(report_service):
+    """Test days after a gap in the rollups are read from raw sales"""
+    user = SimpleNamespace(employee_id="emp_1", store_id="store_1")
+    sales_repo = report_service.sales_repo
+    sales_repo.get_daily_rollups.return_value = [
+        {"date": "2024-01-03", "payment_methods": {"cash": {"count": 5, "total": 50.0}}},
+        {"date": "2024-01-01", "payment_methods": {"cash": {"count": 1, "total": 10.0}}}
+    ]
+    sales_repo.aggregate_sales_report.return_value = [{"_id": "card", "count": 2, "total": 30.0}]
+    
+    report = await report_service.get_sales_report(
+        user,
+        from_date=datetime(2024, 1, 1),
+        to_date=datetime(2024, 1, 5)
+    )
+    
+    sales_repo.aggregate_sales_report.assert_awaited_once_with(
+        "store_1", datetime(2024, 1, 1), datetime(2024, 1, 5),
+        skip_from=datetime(2024, 1, 1), skip_to=datetime(2024, 1, 2)
+    )
+    assert report["total_sales"] == 40.0
+    assert report["total_transactions"] == 3